@@ -211,7 +211,7 @@ class ApplicationPermissionTests(TestCase):
         self.client.force_login(self.admin)
         response = self.client.get("/applications/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreater(len(response.data), 0)
+        self.assertGreater(len(response.data["results"]), 0)
 
     def test_list_applications_denied_for_student(self):
         self.client.force_login(self.student)
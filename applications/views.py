@@ -7,12 +7,15 @@ from .models import TeacherApplication
 from .serializers import TASerializer, TAUpdateSerializer
 from users.permissions import IsStudent, IsAdmin
 from institutions.models import Institution
+from backend.pagination import AdminLimitOffsetPagination
+from backend.upload_handlers import StreamingUploadMixin
+from backend.instrumentation import SerializeTimingMixin
 
 User = get_user_model()
 
 
 # 🟢 Student retrieves or deletes their current application
-class MyApplicationView(generics.RetrieveDestroyAPIView):
+class MyApplicationView(SerializeTimingMixin, generics.RetrieveDestroyAPIView):
     serializer_class = TASerializer
     permission_classes = [permissions.IsAuthenticated, IsStudent]
 
@@ -36,7 +39,7 @@ class MyApplicationView(generics.RetrieveDestroyAPIView):
 
 # 🟢 Student submits a teacher application
 # 🟢 Student submits a teacher application
-class SubmitApplicationView(APIView):
+class SubmitApplicationView(StreamingUploadMixin, APIView):
     permission_classes = [permissions.IsAuthenticated, IsStudent]
 
     def post(self, request):
@@ -72,7 +75,7 @@ class SubmitApplicationView(APIView):
 
 
 # 🟡 Admin approves/rejects applications
-class ManageTApplicationView(generics.RetrieveUpdateAPIView):
+class ManageTApplicationView(SerializeTimingMixin, generics.RetrieveUpdateAPIView):
     queryset = TeacherApplication.objects.all()
     permission_classes = [permissions.IsAuthenticated, IsAdmin]
 
@@ -124,9 +127,11 @@ class ManageTApplicationView(generics.RetrieveUpdateAPIView):
 
 
 # 🔵 List teacher applications (students see pending, Admins see all)
-class ListApplicationsView(generics.ListAPIView):
+class ListApplicationsView(SerializeTimingMixin, generics.ListAPIView):
     serializer_class = TASerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AdminLimitOffsetPagination
+    ordering = ('id',)
 
     def get_queryset(self):
         user = self.request.user
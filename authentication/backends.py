@@ -0,0 +1,76 @@
+"""
+JWT authentication that can skip the user query.
+
+With AUTH_TOKEN_USER on, read-only requests (GET, HEAD, OPTIONS) get a User
+built from the access token's claims (id, role, is_staff, is_superuser; see
+CustomTokenObtainPairSerializer.get_token) instead of a row loaded by id. It
+is a real User instance with every other field deferred, so role checks and
+ORM filters cost nothing and the first read of another field, say
+`full_name`, loads it from the database. Writes always load the full user.
+
+Claims go stale when the user changes. Every save or delete of a user stores
+the time of the change in the cache for one refresh token lifetime, and
+tokens issued before it fall back to the full load, which also rejects
+inactive and deleted users. Refreshing re-stamps the claims and `iat` from
+the user (see CustomTokenRefreshSerializer), so a token refreshed after the
+change carries the new claims rather than copies of the old ones. The marker only reaches other processes through a
+shared cache backend, so only turn this on with one.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+CLAIM_FIELDS = ['role', 'is_staff', 'is_superuser']
+
+
+def _changed_key(user_id):
+    return f'auth:user-changed:{user_id}'
+
+
+def set_claims(token, user):
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+
+
+def mark_changed(user_id):
+    """Make the tokens issued to the user so far load them from the database."""
+    # As long as any token issued before the change can be refreshed or used
+    lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+    timeout = int(lifetime.total_seconds())
+    cache.set(_changed_key(user_id), int(time.time()), timeout)
+
+
+def claims_current(validated_token):
+    """Whether the token carries the user claims and the user has not changed since it was issued."""
+    if any(field not in validated_token for field in CLAIM_FIELDS):
+        return False
+    changed_at = cache.get(_changed_key(validated_token[api_settings.USER_ID_CLAIM]))
+    return changed_at is None or changed_at < validated_token['iat']
+
+
+def token_user(validated_token):
+    """A User holding only the token's claims, every other field deferred."""
+    values = {field: validated_token[field] for field in CLAIM_FIELDS}
+    values[User._meta.pk.attname] = validated_token[api_settings.USER_ID_CLAIM]
+    values['is_active'] = True
+    field_names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    return User.from_db(router.db_for_read(User), field_names, [values[name] for name in field_names])
+
+
+class TokenUserAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        self.from_claims = getattr(settings, 'AUTH_TOKEN_USER', False) and request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if self.from_claims and api_settings.USER_ID_CLAIM in validated_token and claims_current(validated_token):
+            return token_user(validated_token)
+        return super().get_user(validated_token)
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authentication.tokens import PRUNE_BATCH_SIZE, prune_expired
+
+
+class Command(BaseCommand):
+    help = "Delete expired JWT refresh tokens and their blacklist entries in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PRUNE_BATCH_SIZE, help="Tokens deleted per transaction")
+        parser.add_argument('--every', type=int, metavar='SECONDS',
+                            help="Keep running as a background job, pruning every SECONDS")
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            deleted = prune_expired(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Pruned {deleted} expired tokens in {time.perf_counter() - started:.1f}s"
+            ))
+            if not options['every']:
+                return
+            time.sleep(options['every'])
@@ -1,7 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
 from rest_framework.exceptions import AuthenticationFailed
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .backends import set_claims
+from .tokens import RotatingRefreshToken
 
 User = get_user_model()
 
@@ -28,14 +32,22 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Custom JWT Token Serializer to include role info and return
     detailed authentication errors.
+
+    The password is hashed once: the user is checked here and the tokens are
+    issued directly, instead of authenticating again through super().validate().
     """
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        set_claims(token, user)
+        return token
+
     def validate(self, attrs):
         email = attrs.get("email")
         password = attrs.get("password")
 
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
+        user = User.objects.filter(email=email).first()
+        if user is None:
             raise AuthenticationFailed("User with this email does not exist.")
 
         if not user.check_password(password):
@@ -45,10 +57,51 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             raise AuthenticationFailed("This account is inactive.")
 
         # Everything is good, proceed with token generation
-        data = super().validate(attrs)
-        data["role"] = user.role
-        data["is_superuser"] = user.is_superuser
-        data["is_staff"] = user.is_staff
+        self.user = user
+        refresh = self.get_token(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+
+        return {
+            "refresh": str(refresh),
+            "access": str(refresh.access_token),
+            "role": user.role,
+            "is_superuser": user.is_superuser,
+            "is_staff": user.is_staff,
+        }
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh that blacklists the rotated token with one insert; see
+    authentication.tokens.
+
+    The role and staff claims and `iat` are stamped afresh from the user, as
+    simplejwt would otherwise copy them from the refresh token into every new
+    token, and a user changed since login would get their old rights back
+    from claims that look newer than the change (see authentication.backends).
+    """
+    token_class = RotatingRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM, None)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first() if user_id else None
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        set_claims(refresh, user)
+        refresh.set_iat()
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
         return data
 
 class SetPasswordSerializer(serializers.Serializer):
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from users.models import User
+from .backends import mark_changed
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def expire_token_claims(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no claim carries
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    mark_changed(instance.pk)
@@ -1,10 +1,22 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from authentication.backends import TokenUserAuthentication
+from authentication.tokens import prune_expired
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from datetime import timedelta
+from django.utils import timezone
+from tfms.models import TFM
 from authentication.serializers import CustomTokenObtainPairSerializer
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from unittest import mock
+from io import StringIO
+from django.core.management import call_command
+import time
 
 User = get_user_model()
 
@@ -46,6 +58,34 @@ class AuthTests(TestCase):
         self.assertIn("access", response.data)
         self.assertEqual(response.data["role"], self.user.role)
 
+    def test_login_hashes_password_once(self):
+        with mock.patch.object(User, 'check_password', autospec=True, side_effect=User.check_password) as check:
+            response = self.client.post(self.url_login, {
+                "email": self.user.email,
+                "password": "secure123"
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(check.call_count, 1)
+
+    def test_login_token_claims(self):
+        response = self.client.post(self.url_login, {
+            "email": self.user.email,
+            "password": "secure123"
+        })
+        token = AccessToken(response.data["access"])
+        self.assertEqual(token["user_id"], self.user.id)
+        self.assertEqual((token["role"], token["is_staff"], token["is_superuser"]), ("student", False, False))
+
+    def test_login_inactive(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(self.url_login, {
+            "email": self.user.email,
+            "password": "secure123"
+        })
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("This account is inactive", str(response.data))
+
     def test_login_wrong_email(self):
         response = self.client.post(self.url_login, {
             "email": "notfound@example.com",
@@ -134,3 +174,125 @@ class AuthTests(TestCase):
         })
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("cannot be the same as the old", str(response.data))
+
+
+@override_settings(AUTH_TOKEN_USER=True)
+class TokenUserAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="teacher@example.com", full_name="Teacher", password="secure123", role="teacher"
+        )
+        # Tokens issued in the second the user was saved in still load it; start from no change
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, token, method='get'):
+        request = getattr(self.factory, method)("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        user, _ = TokenUserAuthentication().authenticate(request)
+        return user
+
+    def access_token(self):
+        # Issuing a refresh token records it for the blacklist, so do it before counting
+        return CustomTokenObtainPairSerializer.get_token(self.user).access_token
+
+    def test_read_builds_user_from_claims(self):
+        token = self.access_token()
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+            self.assertEqual((user.pk, user.role, user.is_staff, user.is_authenticated), (self.user.pk, "teacher", False, True))
+        # A model instance, so usable in ORM lookups
+        self.assertFalse(TFM.objects.filter(directors=user).exists())
+        with self.assertNumQueries(1):
+            self.assertEqual(user.full_name, "Teacher")
+
+    def test_write_loads_user(self):
+        token = self.access_token()
+        with self.assertNumQueries(1):
+            user = self.authenticate(token, 'post')
+        self.assertEqual(user.get_deferred_fields(), set())
+
+    def test_changed_user_is_loaded(self):
+        token = self.access_token()
+        token['iat'] -= 10  # issued before the change below
+        self.user.role = "student"
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        self.assertEqual(user.role, "student")
+
+    def test_refresh_does_not_restore_old_claims(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", full_name="Admin", password="secure123", role="teacher", is_staff=True
+        )
+        refresh = CustomTokenObtainPairSerializer.get_token(admin)
+        refresh['iat'] -= 120  # logged in two minutes ago
+        # Demoted a minute ago, between the login and the refreshes below
+        with mock.patch('authentication.backends.time.time', return_value=time.time() - 60):
+            admin.is_staff = False
+            admin.save()
+
+        client = APIClient()
+        refresh = str(refresh)
+        for _ in range(2):
+            response = client.post(reverse('token_refresh'), {"refresh": refresh})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            refresh = response.data["refresh"]
+            self.assertFalse(AccessToken(response.data["access"])["is_staff"])
+
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+            response = client.get("/users/")
+            self.assertEqual([user["id"] for user in response.data["results"]], [admin.pk])
+
+    @override_settings(AUTH_TOKEN_USER=False)
+    def test_disabled(self):
+        token = self.access_token()
+        with self.assertNumQueries(1):
+            self.authenticate(token)
+
+
+class TokenRefreshTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="student@example.com", full_name="Student", password="secure123", role="student"
+        )
+        self.url_refresh = reverse('token_refresh')
+
+    def test_refresh_rotates_and_blacklists(self):
+        refresh = RefreshToken.for_user(self.user)
+        response = self.client.post(self.url_refresh, {"refresh": str(refresh)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data["refresh"], str(refresh))
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=refresh["jti"]).exists())
+
+        # Replays are rejected from the cache, then from the blacklist itself
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url_refresh, {"refresh": str(refresh)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        cache.clear()
+        response = self.client.post(self.url_refresh, {"refresh": str(refresh)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(BlacklistedToken.objects.filter(token__jti=refresh["jti"]).count(), 1)
+
+    def test_prune_expired(self):
+        now = timezone.now()
+        tokens = OutstandingToken.objects.bulk_create([
+            OutstandingToken(user=self.user, jti=f"jti-{i}", token="t", created_at=now, expires_at=now + timedelta(days=days))
+            for i, days in enumerate([-2, -1, 1])
+        ])
+        BlacklistedToken.objects.create(token=tokens[0])
+        BlacklistedToken.objects.create(token=tokens[2])
+
+        self.assertEqual(prune_expired(batch_size=1, now=now), 2)
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ["jti-2"])
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+    def test_prune_tokens_command(self):
+        now = timezone.now()
+        OutstandingToken.objects.create(user=self.user, jti="expired", token="t", created_at=now, expires_at=now - timedelta(days=1))
+        out = StringIO()
+        call_command("prune_tokens", batch_size=10, stdout=out)
+        self.assertIn("Pruned 1 expired tokens", out.getvalue())
+        self.assertFalse(OutstandingToken.objects.exists())
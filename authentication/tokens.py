@@ -0,0 +1,86 @@
+"""
+Refresh token rotation and blacklist maintenance.
+
+With ROTATE_REFRESH_TOKENS and BLACKLIST_AFTER_ROTATION every refresh
+blacklists the token it was given. RotatingRefreshToken does that with a
+single insert into the blacklist, whose unique constraint doubles as the
+"already blacklisted?" check, so a refresh no longer looks the token up
+first, and two concurrent refreshes with the same token cannot both pass.
+The rotated token is then recorded with a plain insert.
+Blacklisted jtis are also remembered in the cache until the token expires,
+so a client replaying a rotated token is turned away without a query.
+
+prune_expired() deletes expired tokens in primary key batches. Tokens share
+one lifetime, so the expired ones are the oldest rows and each batch reads
+only the start of the table.
+"""
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+
+PRUNE_BATCH_SIZE = 10000
+
+
+def _blacklisted_key(jti):
+    return f'auth:blacklisted:{jti}'
+
+
+class RotatingRefreshToken(RefreshToken):
+    def check_blacklist(self):
+        if cache.get(_blacklisted_key(self.payload[api_settings.JTI_CLAIM])):
+            raise TokenError(_("Token is blacklisted"))
+        if not (api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION):
+            super().check_blacklist()
+        # Otherwise blacklist() below is the check
+
+    def blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        expires_at = datetime_from_epoch(self.payload['exp'])
+        token_id = OutstandingToken.objects.filter(jti=jti).values_list('pk', flat=True).first()
+        if token_id is None:
+            # Issued before the blacklist app was installed
+            token_id = OutstandingToken.objects.create(
+                jti=jti, user_id=self.payload.get(api_settings.USER_ID_CLAIM), token=str(self),
+                created_at=self.current_time, expires_at=expires_at,
+            ).pk
+
+        try:
+            with transaction.atomic():
+                blacklisted = BlacklistedToken.objects.create(token_id=token_id)
+        except IntegrityError:
+            raise TokenError(_("Token is blacklisted"))
+
+        timeout = int((expires_at - aware_utcnow()).total_seconds())
+        if timeout > 0:
+            cache.set(_blacklisted_key(jti), True, timeout)
+        return blacklisted
+
+    def outstand(self):
+        # Called right after set_jti(), so the jti is new: insert without looking
+        # it up, and without loading the user the refresh has just checked
+        return OutstandingToken.objects.create(
+            jti=self.payload[api_settings.JTI_CLAIM], user_id=self.payload.get(api_settings.USER_ID_CLAIM),
+            token=str(self), created_at=self.current_time, expires_at=datetime_from_epoch(self.payload['exp']),
+        )
+
+
+def prune_expired(batch_size=PRUNE_BATCH_SIZE, now=None):
+    """Delete expired outstanding tokens and their blacklist entries; return how many tokens went."""
+    now = now or aware_utcnow()
+    deleted = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            # only('pk'): the cascade collector would otherwise read every token's text
+            OutstandingToken.objects.filter(pk__in=ids).only('pk').delete()
+        deleted += len(ids)
@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.response import Response
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -21,6 +21,10 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     """ Custom Login View with role information """
     serializer_class = CustomTokenObtainPairSerializer
 
+class CustomTokenRefreshView(TokenRefreshView):
+    """ Refresh view that rotates and blacklists tokens cheaply """
+    serializer_class = CustomTokenRefreshSerializer
+
 class SetPasswordView(generics.GenericAPIView):
     """
     Allow users without a password to set one.
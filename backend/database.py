@@ -0,0 +1,41 @@
+"""
+DATABASES['default'] from a DATABASE_URL.
+
+PostgreSQL connections persist for conn_max_age seconds and are health
+checked before reuse. With pool_size set they come from Django's native
+psycopg connection pool instead (psycopg 3 and psycopg-pool must be
+installed; Django refuses CONN_MAX_AGE together with a pool, so it is 0).
+
+SQLite, for local runs, is switched to WAL so reads no longer wait on the
+writer, and write transactions take the write lock up front (BEGIN
+IMMEDIATE) so two of them queue on the busy timeout instead of one failing
+with "database is locked" when it upgrades from a read lock.
+"""
+import dj_database_url
+
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    # Durable across application crashes in WAL mode; only an OS crash can lose the last commits
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # 20 MB
+]
+SQLITE_TIMEOUT = 20  # seconds a writer waits for the lock
+
+
+def database_config(url, conn_max_age=600, pool_size=0):
+    database = dj_database_url.parse(url, conn_max_age=conn_max_age, conn_health_checks=conn_max_age > 0)
+    options = database.setdefault('OPTIONS', {})
+
+    if database['ENGINE'] == 'django.db.backends.sqlite3':
+        options.update({
+            'init_command': "; ".join(SQLITE_PRAGMAS),
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_TIMEOUT,
+        })
+    elif pool_size > 0:
+        options['pool'] = {'min_size': min(2, pool_size), 'max_size': pool_size}
+        database['CONN_MAX_AGE'] = 0
+        database['CONN_HEALTH_CHECKS'] = False
+
+    return database
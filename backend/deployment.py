@@ -1,7 +1,7 @@
 import os
-import dj_database_url
 from .settings import *
 from .settings import BASE_DIR
+from .database import database_config
 
 ALLOWED_HOSTS = [os.environ.get('RENDER_EXTERNAL_HOSTNAME')]
 CSRF_TRUSTED_ORIGINS = ['https://' + os.environ.get('RENDER_EXTERNAL_HOSTNAME')]
@@ -10,6 +10,7 @@ DEBUG = False
 SECRET_KEY = os.environ.get('SECRET_KEY')
 
 MIDDLEWARE = [
+    'backend.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -20,15 +21,19 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
 ]
 
+# Measure a sample of live requests only, e.g. 0.01 for 1%
+QUERY_INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('QUERY_INSTRUMENTATION_SAMPLE_RATE', 0))
+
 CORS_ALLOWED_ORIGINS = [
     'https://react-next-swart-zeta.vercel.app',
     'https://vercel-react-next.vercel.app',
 ]
 
 DATABASES = {
-    'default' : dj_database_url.config(
-        default=os.environ['DATABASE_URL'],
-        conn_max_age=600
+    'default': database_config(
+        os.environ['DATABASE_URL'],
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 0)),
     )
 }
 
@@ -0,0 +1,158 @@
+"""
+Per-request SQL instrumentation.
+
+QueryInstrumentationMiddleware measures a sample of requests: the number of
+queries, the time spent in SQL, the time spent building serializer data
+(in views with SerializeTimingMixin), the time spent rendering the response
+body (for DRF, encoding the serialized data) and the queries repeated with
+the same shape (the signature of an N+1 loop). The numbers go out as a
+`Server-Timing` header, readable in browser dev tools, and as one structured
+log record per request on the `backend.queries` logger, at WARNING when a
+repeated query crosses the threshold.
+
+QUERY_INSTRUMENTATION_SAMPLE_RATE sets the share of requests measured (0, the
+default, turns it off) and QUERY_INSTRUMENTATION_DUPLICATE_THRESHOLD how many repeats
+of one query count as an N+1.
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import cache
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import ListSerializer
+
+logger = logging.getLogger('backend.queries')
+
+_current = ContextVar('query_metrics', default=None)
+
+# Collapse "IN (%s, %s, ...)" so lookups of different sizes share a fingerprint
+_PLACEHOLDER_LIST = re.compile(r'\((?:%s,\s*)+%s\)')
+
+
+def fingerprint(sql):
+    return _PLACEHOLDER_LIST.sub('(...)', sql)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.render_seconds = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook: time and fingerprint every query."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self, threshold):
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'QUERY_INSTRUMENTATION_SAMPLE_RATE', 0.0)
+        self.duplicate_threshold = getattr(settings, 'QUERY_INSTRUMENTATION_DUPLICATE_THRESHOLD', 5)
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as hooks:
+                for connection in connections.all():
+                    hooks.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_seconds = time.perf_counter() - started
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.sql_seconds * 1000:.1f};desc="{metrics.queries} queries"',
+            f'serialize;dur={metrics.serialize_seconds * 1000:.1f}',
+            f'render;dur={metrics.render_seconds * 1000:.1f}',
+            f'total;dur={total_seconds * 1000:.1f}',
+        ])
+
+        duplicates = metrics.duplicates(self.duplicate_threshold)
+        logger.log(
+            logging.WARNING if duplicates else logging.INFO,
+            "%s %s %s: %d queries in %.1fms",
+            request.method, request.path, response.status_code, metrics.queries, metrics.sql_seconds * 1000,
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': metrics.queries,
+                'sql_ms': round(metrics.sql_seconds * 1000, 2),
+                'serialize_ms': round(metrics.serialize_seconds * 1000, 2),
+                'render_ms': round(metrics.render_seconds * 1000, 2),
+                'total_ms': round(total_seconds * 1000, 2),
+                'duplicate_queries': [{'sql': sql, 'count': count} for sql, count in duplicates],
+            },
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before the handler renders the response (DRF responses included)
+        metrics = _current.get()
+        if metrics is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                metrics.render_seconds += time.perf_counter() - started
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class _TimedData:
+    @property
+    def data(self):
+        metrics = _current.get()
+        if metrics is None:
+            return super().data
+        started = time.perf_counter()
+        try:
+            return super().data
+        finally:
+            metrics.serialize_seconds += time.perf_counter() - started
+
+
+@cache
+def timed_serializer_class(serializer_class):
+    """A subclass of serializer_class whose .data counts towards the request's serialize time."""
+    # many=True builds Meta.list_serializer_class around the child, so time that one instead
+    meta = getattr(serializer_class, 'Meta', None)
+    attrs = {}
+    if not issubclass(serializer_class, ListSerializer):
+        list_serializer_class = timed_serializer_class(getattr(meta, 'list_serializer_class', ListSerializer))
+        attrs['Meta'] = type('Meta', (meta,) if meta else (), {'list_serializer_class': list_serializer_class})
+    return type(serializer_class.__name__, (_TimedData, serializer_class), attrs)
+
+
+class SerializeTimingMixin:
+    """Time building the data of serializers from get_serializer() on measured requests."""
+
+    def get_serializer(self, *args, **kwargs):
+        if _current.get() is None:
+            return super().get_serializer(*args, **kwargs)
+        # Views pick their serializer in get_serializer_class() without calling super()
+        serializer_class = timed_serializer_class(self.get_serializer_class())
+        kwargs.setdefault('context', self.get_serializer_context())
+        return serializer_class(*args, **kwargs)
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+
+def view_ordering(view, default):
+    """The view's declared `ordering`, falling back to the paginator's."""
+    ordering = getattr(view, 'ordering', None) or default
+    if isinstance(ordering, str):
+        return (ordering,)
+    return tuple(ordering)
+
+
+class OptOutPaginationMixin:
+    """
+    Lets a client ask for a plain list with ?paginate=false. The list is
+    capped at MAX_UNPAGINATED_RESULTS rows; when the cap cuts it short the
+    response carries an `X-Truncated: true` header.
+    """
+    opt_out_query_param = 'paginate'
+    max_unpaginated_results = getattr(settings, 'MAX_UNPAGINATED_RESULTS', 1000)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        value = request.query_params.get(self.opt_out_query_param, '')
+        self.unpaginated = value.lower() in ('false', '0', 'no')
+        if not self.unpaginated:
+            return super().paginate_queryset(queryset, request, view)
+
+        if isinstance(queryset, QuerySet):
+            queryset = queryset.order_by(*view_ordering(view, self.ordering))
+        rows = list(queryset[:self.max_unpaginated_results + 1])
+        self.truncated = len(rows) > self.max_unpaginated_results
+        return rows[:self.max_unpaginated_results]
+
+    def get_paginated_response(self, data):
+        if not self.unpaginated:
+            return super().get_paginated_response(data)
+        headers = {'X-Truncated': 'true'} if self.truncated else None
+        return Response(data, headers=headers)
+
+
+class StableCursorPagination(OptOutPaginationMixin, CursorPagination):
+    """
+    Cursor pagination for large tables. Pages stay stable while rows are
+    inserted as long as the ordering ends in a unique, unchanging field; views
+    declare it with an `ordering` attribute and default to id.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        return view_ordering(view, self.ordering)
+
+
+class AdminLimitOffsetPagination(OptOutPaginationMixin, LimitOffsetPagination):
+    """Limit/offset pagination with a total count, for admin screens that jump between pages."""
+    ordering = 'id'
+    max_limit = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if isinstance(queryset, QuerySet) and not queryset.ordered:
+            queryset = queryset.order_by(*view_ordering(view, self.ordering))
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,113 @@
+"""
+Response caching for the public read endpoints.
+
+Views decorated with @cached_response(scope) store their response data in the
+default cache, keyed by the request path and query string and by the current
+generation tokens of the scope. Writes never delete cached responses: they
+replace a generation token (see invalidate()), so every key built from the
+old token stops matching and the stale entries simply expire.
+
+Each scope has a root generation, a generation for lists that are not
+filtered by semester, and one per semester. A request for ?semester=3 is
+keyed by the root and semester 3 tokens, so a write to semester 5 leaves it
+cached.
+
+The generations live in the cache too, so with a shared backend (Redis,
+file) a write in one worker invalidates every worker. With the default
+locmem backend each process only sees its own writes, and other processes
+keep serving their copy until RESPONSE_CACHE_TIMEOUT.
+
+Tokens are replaced once the write's transaction commits. Replaced before,
+a concurrent read could cache the old data under the new token and serve
+it for the whole timeout.
+"""
+from functools import wraps
+from hashlib import md5
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+SCHEDULE = 'schedule'
+SEMESTERS = 'semesters'
+INSTITUTIONS = 'institutions'
+
+ALL_SEMESTERS = 'all'
+
+
+def _generation_key(scope, semester=None):
+    return f'responses:{scope}:generation' + (f':{semester}' if semester is not None else '')
+
+
+def _generations(keys):
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, uuid4().hex, None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def _semester_of(request):
+    semester = request.query_params.get('semester', '')
+    return semester if semester.isdigit() else ALL_SEMESTERS
+
+
+def response_key(scope, request):
+    keys = [_generation_key(scope), _generation_key(scope, _semester_of(request))]
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    # The host is part of the key: pagination links are absolute URLs
+    url = f'{request.build_absolute_uri(request.path)}?{query}'
+    digest = md5(url.encode(), usedforsecurity=False).hexdigest()
+    return f'responses:{scope}:{":".join(_generations(keys))}:{digest}'
+
+
+def invalidate(scope, *semester_ids):
+    """
+    Drop the cached responses of a scope touching the given semesters, plus
+    the unfiltered lists, when the current transaction commits (at once
+    outside one). Without semester ids, drop all of the scope's.
+    """
+    if semester_ids:
+        semesters = {ALL_SEMESTERS, *(semester_id for semester_id in semester_ids if semester_id is not None)}
+        keys = [_generation_key(scope, semester) for semester in semesters]
+    else:
+        keys = [_generation_key(scope)]
+    transaction.on_commit(lambda: cache.set_many({key: uuid4().hex for key in keys}, None))
+
+
+def invalidate_all():
+    for scope in (SCHEDULE, SEMESTERS, INSTITUTIONS):
+        invalidate(scope)
+
+
+def cached_response(scope):
+    """
+    Cache a viewset action's 200 responses. Only use it on actions whose
+    output does not depend on who is asking.
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 5 * 60)
+            if timeout <= 0 or request.method != 'GET':
+                return view_method(self, request, *args, **kwargs)
+
+            key = response_key(scope, request)
+            cached = cache.get(key)
+            if cached is not None:
+                data, headers = cached
+                return Response(data, headers={**headers, 'X-Cache': 'HIT'})
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                # Headers set by the view, such as X-Truncated; the renderer sets Content-Type
+                headers = {name: value for name, value in response.items() if name != 'Content-Type'}
+                cache.set(key, (response.data, headers), timeout)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -1,7 +1,95 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from botocore.exceptions import ClientError
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 from django.conf import settings
+from django.utils.text import get_valid_filename
 from urllib.parse import urlparse
 
+S3_MIN_PART_SIZE = 5 * 1024 * 1024  # every part but the last must be at least this big
+STREAMING_UPLOAD_PREFIX = 'uploads/'
+
+
+class MultipartUpload:
+    """
+    Writes one object as an S3 multipart upload, fed by write() calls.
+
+    Data is sent part_size bytes at a time by a pool of `concurrency` threads.
+    write() blocks while that many parts are in flight, so memory holds at
+    most the part being filled plus the parts being sent, whatever the size
+    of the object. An object smaller than one part is sent with a single PUT.
+    """
+
+    def __init__(self, client, bucket, key, content_type=None, part_size=S3_MIN_PART_SIZE, concurrency=2):
+        self.client, self.bucket, self.key = client, bucket, key
+        self.extra = {'ContentType': content_type} if content_type else {}
+        self.part_size = max(part_size, S3_MIN_PART_SIZE)
+        self.concurrency = concurrency
+        self.buffer, self.buffered, self.size = [], 0, 0
+        self.upload_id, self.executor, self.futures = None, None, []
+        self.slots = threading.BoundedSemaphore(concurrency)
+
+    def write(self, data):
+        self.buffer.append(data)
+        self.buffered += len(data)
+        self.size += len(data)
+        while self.buffered >= self.part_size:
+            data = b''.join(self.buffer)
+            self.buffer, self.buffered = [data[self.part_size:]], len(data) - self.part_size
+            self._send_part(data[:self.part_size])
+
+    def complete(self):
+        """Send what is left and finish the object."""
+        body, self.buffer = b''.join(self.buffer), []
+        if self.upload_id is None:
+            self.client.put_object(Bucket=self.bucket, Key=self.key, Body=body, **self.extra)
+            return
+        try:
+            if body:
+                self._send_part(body)
+            parts = [future.result() for future in self.futures]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, MultipartUpload={'Parts': parts},
+            )
+        except Exception:
+            self.abort()
+            raise
+        self.executor.shutdown()
+
+    def abort(self):
+        self.buffer = []
+        if self.upload_id is None:
+            return
+        self.executor.shutdown(cancel_futures=True)
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+        self.upload_id = None
+
+    def _send_part(self, body):
+        if self.upload_id is None:
+            self.upload_id = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, **self.extra
+            )['UploadId']
+            self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='s3-upload')
+        self.slots.acquire()
+        failed = next((future for future in self.futures if future.done() and future.exception()), None)
+        if failed:
+            self.slots.release()
+            self.abort()
+            raise failed.exception()
+        future = self.executor.submit(self._upload_part, len(self.futures) + 1, body)
+        future.add_done_callback(lambda future: self.slots.release())
+        self.futures.append(future)
+
+    def _upload_part(self, number, body):
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id, PartNumber=number, Body=body,
+        )
+        return {'PartNumber': number, 'ETag': response['ETag']}
+
+
 class StaticS3Boto3Storage(S3Boto3Storage):
     location = getattr(settings, "STATICFILES_LOCATION", "")
 
@@ -21,3 +109,59 @@ class S3MediaStorage(S3Boto3Storage):
             parsed = urlparse(minio_url)
             self.custom_domain = parsed.netloc  # ✅ only 'localhost:9000'
         super().__init__(*args, **kwargs)
+
+    def presigned_post(self, name, max_size, expires_in, content_type=None):
+        """
+        URL and form fields letting a client POST the object `name` straight
+        to the bucket, between 1 and max_size bytes, within expires_in seconds.
+        """
+        fields, conditions = {}, [['content-length-range', 1, max_size]]
+        if content_type:
+            fields['Content-Type'] = content_type
+            conditions.append({'Content-Type': content_type})
+        post = self.bucket.meta.client.generate_presigned_post(
+            self.bucket_name, self._normalize_name(clean_name(name)),
+            Fields=fields, Conditions=conditions, ExpiresIn=expires_in,
+        )
+        minio_url = getattr(settings, "MINIO_ACCESS_URL", None)
+        if minio_url:
+            # The signed policy does not cover the host, so point browsers at
+            # the public MinIO address rather than the internal endpoint
+            parsed, public = urlparse(post['url']), urlparse(minio_url)
+            post['url'] = parsed._replace(scheme=public.scheme, netloc=public.netloc).geturl()
+        return post
+
+    def object_metadata(self, name):
+        """{'size', 'etag'} of a stored object, or None if it does not exist."""
+        try:
+            head = self.bucket.meta.client.head_object(
+                Bucket=self.bucket_name, Key=self._normalize_name(clean_name(name))
+            )
+        except ClientError as e:
+            if e.response['ResponseMetadata']['HTTPStatusCode'] == 404:
+                return None
+            raise
+        return {'size': head['ContentLength'], 'etag': head['ETag'].strip('"')}
+
+    def streaming_upload(self, filename, content_type=None):
+        """
+        A MultipartUpload to a temporary object, for backend.upload_handlers.
+        Saving the resulting file copies it to its final name in the bucket.
+        """
+        key = f"{STREAMING_UPLOAD_PREFIX}{uuid4().hex}/{get_valid_filename(filename)}"
+        return MultipartUpload(
+            self.bucket.meta.client, self.bucket_name, self._normalize_name(clean_name(key)), content_type,
+            part_size=getattr(settings, 'STREAMING_UPLOAD_PART_SIZE', S3_MIN_PART_SIZE),
+            concurrency=getattr(settings, 'STREAMING_UPLOAD_CONCURRENCY', 2),
+        )
+
+    def _save(self, name, content):
+        source = getattr(content, 'object_key', None)
+        if source is None or getattr(content, 'bucket_name', None) != self.bucket_name:
+            return super()._save(name, content)
+        # Already in the bucket: copy it server side instead of uploading it again
+        name = clean_name(name)
+        self.bucket.meta.client.copy(
+            {'Bucket': self.bucket_name, 'Key': source}, self.bucket_name, self._normalize_name(name),
+        )
+        return name
@@ -0,0 +1,227 @@
+import itertools
+from datetime import date, time, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from backend import response_cache
+from backend.database import database_config
+from backend.instrumentation import RequestMetrics, fingerprint, timed_serializer_class
+from backend.pagination import OptOutPaginationMixin
+from backend.storage import S3_MIN_PART_SIZE, STREAMING_UPLOAD_PREFIX, MultipartUpload
+from applications.models import TeacherApplication
+from institutions.models import Institution
+from semesters.models import Semester
+from tracks.models import Track
+from tracks.serializers import TrackReadSerializer
+
+
+@override_settings(QUERY_INSTRUMENTATION_SAMPLE_RATE=1.0)
+class QueryInstrumentationTestCase(TestCase):
+    def setUp(self):
+        # A new client loads the middleware again, under the overridden settings
+        self.client = APIClient()
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_server_timing_header(self):
+        # A clock that moves one second per reading, so every measured span is non-zero
+        with self.assertLogs('backend.queries', level='INFO') as logs, \
+                mock.patch('backend.instrumentation.time.perf_counter', side_effect=itertools.count()):
+            response = self.client.get("/tracks/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, render;dur=[\d.]+, total;dur=[\d.]+$')
+
+        record = logs.records[0]
+        self.assertEqual(record.levelname, 'INFO')
+        self.assertEqual((record.method, record.path, record.status), ('GET', '/tracks/', 200))
+        self.assertEqual(record.duplicate_queries, [])
+        self.assertGreater(record.serialize_ms, 0)
+        self.assertGreater(record.render_ms, 0)
+
+    @override_settings(QUERY_INSTRUMENTATION_DUPLICATE_THRESHOLD=1, RESPONSE_CACHE_TIMEOUT=0)
+    def test_repeated_queries_logged_as_warning(self):
+        with self.assertLogs('backend.queries', level='WARNING') as logs:
+            self.client.get("/tracks/")
+        record = logs.records[0]
+        self.assertGreater(record.queries, 0)
+        self.assertEqual(sum(item['count'] for item in record.duplicate_queries), record.queries)
+
+    @override_settings(QUERY_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_disabled(self):
+        with self.assertNoLogs('backend.queries'):
+            response = self.client.get("/tracks/")
+        self.assertNotIn('Server-Timing', response)
+
+    def test_timed_serializer_class(self):
+        timed = timed_serializer_class(TrackReadSerializer)
+        self.assertIs(timed, timed_serializer_class(TrackReadSerializer))
+        self.assertTrue(issubclass(timed, TrackReadSerializer))
+        self.assertEqual(timed.Meta.fields, TrackReadSerializer.Meta.fields)
+        self.assertIsInstance(timed(many=True), timed.Meta.list_serializer_class)
+
+    def test_fingerprint_collapses_in_lists(self):
+        self.assertEqual(
+            fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s, %s)'),
+            fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s)'),
+        )
+
+    def test_duplicates(self):
+        metrics = RequestMetrics()
+        execute = lambda sql, params, many, context: None
+        for _ in range(3):
+            metrics(execute, 'SELECT a FROM t WHERE id = %s', [1], False, {})
+        metrics(execute, 'SELECT b FROM t', [], False, {})
+        self.assertEqual(metrics.queries, 4)
+        self.assertEqual(metrics.duplicates(3), [('SELECT a FROM t WHERE id = %s', 3)])
+
+
+class DatabaseConfigTestCase(TestCase):
+    def test_sqlite(self):
+        database = database_config("sqlite:////tmp/db.sqlite3")
+        self.assertEqual(database['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertIn("PRAGMA journal_mode=WAL", database['OPTIONS']['init_command'])
+        self.assertEqual(database['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+
+    def test_postgres_persistent_connections(self):
+        database = database_config("postgres://tfms:secret@db:5432/tfms", conn_max_age=300)
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((database['CONN_MAX_AGE'], database['CONN_HEALTH_CHECKS']), (300, True))
+        self.assertNotIn('pool', database['OPTIONS'])
+
+    def test_postgres_pool(self):
+        database = database_config("postgres://tfms:secret@db:5432/tfms", pool_size=10)
+        self.assertEqual(database['OPTIONS']['pool'], {'min_size': 2, 'max_size': 10})
+        # Django rejects persistent connections alongside a pool
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=300)
+class ResponseCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.spring, self.autumn = [
+            Semester.objects.create(
+                name=name, start_date=start, end_date=start + timedelta(days=150),
+                int_presentation_date=start + timedelta(days=130), last_presentation_date=start + timedelta(days=140),
+                daily_start_time=time(9, 0), daily_end_time=time(17, 0),
+                pre_duration=timedelta(minutes=45), min_committees=3, max_committees=5,
+            )
+            for name, start in [("Spring 2025", date(2025, 2, 1)), ("Autumn 2025", date(2025, 9, 1))]
+        ]
+        Track.objects.create(title="Spring track", semester=self.spring)
+        Track.objects.create(title="Autumn track", semester=self.autumn)
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client.get(f"/tracks/?semester={self.spring.pk}")
+        with self.assertNumQueries(0):
+            second = self.client.get(f"/tracks/?semester={self.spring.pk}")
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.json(), second.json())
+
+    def test_write_invalidates_only_its_semester(self):
+        self.client.get(f"/tracks/?semester={self.spring.pk}")
+        self.client.get(f"/tracks/?semester={self.autumn.pk}")
+        self.client.get("/tracks/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response_cache.invalidate(response_cache.SCHEDULE, self.spring.pk)
+            # Not before the write commits, or a concurrent read could cache the old data anew
+            self.assertEqual(self.client.get(f"/tracks/?semester={self.spring.pk}")['X-Cache'], 'HIT')
+
+        self.assertEqual(self.client.get(f"/tracks/?semester={self.spring.pk}")['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(f"/tracks/?semester={self.autumn.pk}")['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get("/tracks/")['X-Cache'], 'MISS')
+
+    def test_model_writes_invalidate(self):
+        self.client.get("/tracks/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Track.objects.create(title="New track", semester=self.spring)
+        response = self.client.get("/tracks/")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 3)
+
+        self.client.get("/semesters/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.spring.name = "Spring 2025 (renamed)"
+            self.spring.save()
+        response = self.client.get("/semesters/")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertIn("Spring 2025 (renamed)", [semester['name'] for semester in response.data['results']])
+
+    def test_view_headers_are_kept(self):
+        with mock.patch.object(OptOutPaginationMixin, 'max_unpaginated_results', 1):
+            self.client.get("/tracks/?paginate=false")
+            response = self.client.get("/tracks/?paginate=false")
+        self.assertEqual((response['X-Cache'], response['X-Truncated']), ('HIT', 'true'))
+
+
+class StreamingUploadTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.content = bytes(range(256)) * (11 * 2 ** 20 // 256)  # 11 MiB, three parts
+
+    def write(self, content, **settings):
+        with override_settings(**settings):
+            upload = default_storage.streaming_upload("thesis.pdf", "application/pdf")
+        for start in range(0, len(content), 2 ** 16):
+            upload.write(content[start:start + 2 ** 16])
+        upload.complete()
+        self.addCleanup(default_storage.delete, upload.key)
+        return upload
+
+    def test_large_object_is_sent_in_parts(self):
+        upload = self.write(self.content, STREAMING_UPLOAD_CONCURRENCY=2)
+        self.assertEqual(len(upload.futures), 3)
+        metadata = default_storage.object_metadata(upload.key)
+        self.assertEqual(metadata['size'], len(self.content))
+        self.assertTrue(metadata['etag'].endswith('-3'))
+        with default_storage.open(upload.key) as stored:
+            self.assertEqual(stored.read(), self.content)
+
+    def test_small_object_is_sent_in_one_request(self):
+        upload = self.write(b"small", STREAMING_UPLOAD_PART_SIZE=1)
+        self.assertEqual(upload.part_size, S3_MIN_PART_SIZE)
+        self.assertIsNone(upload.upload_id)
+        self.assertEqual(default_storage.object_metadata(upload.key)['size'], 5)
+
+    def test_failed_part_aborts_the_upload(self):
+        upload = default_storage.streaming_upload("thesis.pdf")
+        client = upload.client
+        with mock.patch.object(client, 'upload_part', side_effect=RuntimeError("connection lost")), \
+                mock.patch.object(client, 'abort_multipart_upload', wraps=client.abort_multipart_upload) as abort:
+            with self.assertRaises(RuntimeError):
+                for start in range(0, len(self.content), 2 ** 20):
+                    upload.write(self.content[start:start + 2 ** 20])
+                upload.complete()
+        abort.assert_called_once()
+        self.assertIsNone(default_storage.object_metadata(upload.key))
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_view_upload_is_streamed_and_moved(self):
+        student = get_user_model().objects.create_user(
+            email="student@example.com", full_name="Student", password="pass", role="student",
+        )
+        institution = Institution.objects.create(name="UAB", city="Bellaterra")
+        self.client.force_authenticate(user=student)
+
+        with mock.patch.object(MultipartUpload, 'complete', autospec=True, side_effect=MultipartUpload.complete) as complete:
+            response = self.client.post("/applications/submit/", {
+                "institution": institution.id,
+                "attachment": SimpleUploadedFile("cv.pdf", self.content, content_type="application/pdf"),
+            }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(len(complete.call_args.args[0].futures), 3)
+
+        attachment = TeacherApplication.objects.get(user=student).attachment
+        self.addCleanup(attachment.delete, save=False)
+        self.assertTrue(attachment.name.startswith("attachments/"))
+        self.assertEqual(attachment.read(), self.content)
+        # The temporary object is gone once the request is over
+        self.assertEqual(default_storage.listdir(STREAMING_UPLOAD_PREFIX), ([], []))
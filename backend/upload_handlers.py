@@ -0,0 +1,109 @@
+"""
+Streaming file uploads to the media bucket.
+
+Django normally reads an uploaded file into memory or a temporary file
+and the storage then sends it to S3 in one go. With StreamingUploadMixin on
+a view, StreamingUploadHandler pipes the request body straight into an S3
+multipart upload (see backend.storage.MultipartUpload) of a temporary
+object under uploads/. The view gets a StreamedUploadedFile, and saving it
+to a FileField copies the object to its final name inside the bucket. The
+temporary object is deleted when the request finishes.
+
+Memory stays bounded by STREAMING_UPLOAD_PART_SIZE times
+STREAMING_UPLOAD_CONCURRENCY + 1 whatever the file size. Requests small
+enough for FILE_UPLOAD_MAX_MEMORY_SIZE, and storages without
+streaming_upload(), are left to Django's own handlers.
+
+If a worker dies mid-request the temporary object, or an unfinished
+multipart upload, stays behind: give the bucket a lifecycle rule expiring
+uploads/ and aborting incomplete multipart uploads after a day.
+"""
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class StreamedUploadedFile(UploadedFile):
+    """An uploaded file already stored as object_key; read on demand."""
+
+    def __init__(self, storage, object_key, name, content_type, size, charset, content_type_extra=None):
+        self.storage = storage
+        self.object_key = object_key
+        self.bucket_name = storage.bucket_name
+        self._file = None
+        super().__init__(None, name, content_type, size, charset, content_type_extra)
+
+    @property
+    def file(self):
+        # Validators that look inside the file (ImageField) read it back from the bucket
+        if self._file is None:
+            self._file = self.storage.open(self.object_key)
+        return self._file
+
+    @file.setter
+    def file(self, value):
+        self._file = value
+
+    def open(self, mode=None):
+        self.seek(0)
+        return self
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.storage.delete(self.object_key)
+
+
+class StreamingUploadHandler(FileUploadHandler):
+    chunk_size = 64 * 2 ** 10
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.activated = False
+        self.upload = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.activated = (
+            hasattr(default_storage, 'streaming_upload')
+            and (content_length is None or content_length > settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+        )
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        if self.activated:
+            self.upload = default_storage.streaming_upload(self.file_name, self.content_type)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.upload is None:
+            return raw_data
+        try:
+            self.upload.write(raw_data)
+        except Exception:
+            self.upload.abort()
+            self.upload = None
+            raise
+
+    def file_complete(self, file_size):
+        if self.upload is None:
+            return None
+        upload, self.upload = self.upload, None
+        upload.complete()
+        return StreamedUploadedFile(
+            default_storage, upload.key, self.file_name, self.content_type, file_size,
+            self.charset, self.content_type_extra,
+        )
+
+    def upload_interrupted(self):
+        if self.upload is not None:
+            self.upload.abort()
+            self.upload = None
+
+
+class StreamingUploadMixin:
+    """Stream the view's multipart file uploads to the media bucket."""
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers.insert(0, StreamingUploadHandler(request))
+        return super().initialize_request(request, *args, **kwargs)
@@ -0,0 +1,92 @@
+import json
+from pathlib import Path
+
+from django.core import management
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from benchmarks import runner
+
+
+class Command(BaseCommand):
+    help = "Seed a scaled dataset in a throwaway test database and benchmark the hot API endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help="Dataset scale passed to seed_all --scale")
+        parser.add_argument('--iterations', type=int, default=20, help="Timed requests per endpoint")
+        parser.add_argument('--only', action='append', help="Run only this scenario, repeatable")
+        parser.add_argument('--output', default='benchmarks/results.json', help="Where to write the results")
+        parser.add_argument('--baseline', help="Results file to compare against")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Allowed growth over the baseline, as a fraction (default 0.2 = 20%%)")
+        parser.add_argument('--writers', type=int, default=0,
+                            help="Also measure write throughput with this many concurrent connections")
+        parser.add_argument('--write-transactions', type=int, default=200,
+                            help="Write transactions committed by each writer")
+        parser.add_argument('--tokens', type=int, default=0,
+                            help="Also time token refresh and pruning over this many outstanding tokens")
+        parser.add_argument('--keepdb', action='store_true', help="Reuse the benchmark database between runs")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            baseline = json.loads(Path(options['baseline']).read_text())['results']
+
+        # Never touch the configured database: seed and measure in a test one
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST']['NAME']:
+            # The default in-memory test database has no WAL and cannot take
+            # concurrent writers; use a file so SQLite behaves as it does locally.
+            connection.settings_dict['TEST']['NAME'] = str(Path(old_name).with_name('benchmark.sqlite3'))
+        connection.creation.create_test_db(verbosity=0, keepdb=options['keepdb'])
+        try:
+            management.call_command("seed_all", scale=options['scale'], stdout=self.stdout)
+            results = runner.run_all(options['iterations'], options['only'])
+            password_hash = runner.password_hash()
+            tokens = None
+            if options['tokens']:
+                runner.seed_outstanding_tokens(options['tokens'])
+                results['token_refresh'] = runner.token_refresh(options['iterations'])
+                tokens = {'outstanding': options['tokens'], 'prune': runner.prune_tokens()}
+            throughput = None
+            if options['writers']:
+                throughput = runner.write_throughput(options['writers'], options['write_transactions'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<22} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+                f"{result['queries']:>3} queries  {result['bytes']:>8} bytes  {result['status']}"
+            )
+
+        if tokens:
+            self.stdout.write(
+                f"{'prune_tokens':<22} {tokens['prune']['deleted']} of {tokens['outstanding']} tokens "
+                f"in {tokens['prune']['seconds']}s"
+            )
+        self.stdout.write(f"{'password_hash':<22} p50 {password_hash['p50_ms']:>8.2f}ms  {password_hash['algorithm']}")
+        if throughput:
+            self.stdout.write(
+                f"{'write_throughput':<22} {throughput['per_second']:>8.1f} tx/s  {throughput['writers']} writers "
+                f"on {throughput['vendor']}  {throughput['failures']} failed"
+            )
+
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps({
+            'scale': options['scale'], 'iterations': options['iterations'], 'results': results,
+            'password_hash': password_hash,
+            'tokens': tokens,
+            'write_throughput': throughput,
+        }, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"✅ Results written to {output}"))
+
+        if baseline is not None:
+            failures = runner.regressions(results, baseline, options['threshold'])
+            if failures:
+                raise CommandError("Regressions over the baseline:\n" + "\n".join(failures))
+            self.stdout.write(self.style.SUCCESS("✅ No regressions over the baseline"))
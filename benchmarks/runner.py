@@ -0,0 +1,226 @@
+"""
+In-process benchmark runner.
+
+Each scenario is one request driven through the DRF test client, repeated a
+number of times. Every run records the wall time, the number of queries and
+the response size; a scenario's result keeps the p50/p95 latency, the
+highest query count and the largest response. Scenarios run with the
+response cache off: a cached response costs no queries, and would hide the
+work every write makes the next reader do again.
+
+token_refresh() times POST /auth/refresh/ with a fresh refresh token each
+time, and prune_tokens() the deletion of expired ones, both over the
+outstanding token table seed_outstanding_tokens() fills.
+
+password_hash() times one check of the configured password hasher, the
+floor under the login scenario's latency.
+
+write_throughput() measures the database rather than an endpoint: several
+threads, each with its own connection, commit short write transactions at
+the same time, the pattern that serializes committee sign-ups on SQLite.
+"""
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from authentication.tokens import prune_expired
+from institutions.models import Institution
+from semesters.models import Semester
+from users.models import User
+
+STUDENT_EMAIL = "bulk.student1@example.com"
+TEACHER_EMAIL = "bulk.teacher1@example.com"
+PASSWORD = "pass1234"
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def scenarios():
+    """(name, user email or None, method, path, data) for every hot endpoint."""
+    # The most recent semester that has slots, for the per-semester slot list
+    semester = (
+        Semester.objects.filter(track__slots__isnull=False).order_by('-start_date').first()
+        or Semester.objects.order_by('-start_date').first()
+    )
+    semester_id = semester.pk if semester else ''
+    return [
+        ("tribunals_available", TEACHER_EMAIL, 'get', "/tribunals/available/", None),
+        ("tribunals_ready", None, 'get', "/tribunals/ready/", None),
+        ("slots_by_semester", None, 'get', f"/slots/?semester={semester_id}", None),
+        ("tracks", None, 'get', "/tracks/", None),
+        ("tfms_my", STUDENT_EMAIL, 'get', "/tfms/my/", None),
+        ("token_obtain", None, 'post', "/auth/login/", {"email": STUDENT_EMAIL, "password": PASSWORD}),
+    ]
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+def run_scenario(user, method, path, data, iterations, warmup=1):
+    client = APIClient()
+    if user is not None:
+        client.force_authenticate(user=user)
+    request = getattr(client, method)
+
+    for _ in range(warmup):
+        request(path, data, format='json')
+
+    timings, queries, sizes, status_codes = [], [], [], set()
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = request(path, data, format='json')
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        sizes.append(len(response.content))
+        status_codes.add(response.status_code)
+
+    return {
+        'p50_ms': round(percentile(timings, 0.50), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'queries': max(queries),
+        'bytes': max(sizes),
+        'status': sorted(status_codes),
+    }
+
+
+def run_all(iterations, only=None):
+    users = {user.email: user for user in User.objects.filter(email__in=[STUDENT_EMAIL, TEACHER_EMAIL])}
+    results = {}
+    for name, email, method, path, data in scenarios():
+        if only and name not in only:
+            continue
+        user = users.get(email) if email else None
+        results[name] = {'path': path, **run_scenario(user, method, path, data, iterations)}
+    return results
+
+
+def seed_outstanding_tokens(count, batch_size=10000):
+    """
+    Insert `count` outstanding tokens for the benchmark student, the older
+    half expired, and blacklist every other one, as months of rotation would.
+    """
+    user = User.objects.get(email=STUDENT_EMAIL)
+    now = timezone.now()
+    for start in range(0, count, batch_size):
+        numbers = range(start, min(start + batch_size, count))
+        with transaction.atomic():
+            tokens = OutstandingToken.objects.bulk_create([
+                OutstandingToken(
+                    user=user, jti=f"benchmark-{i}", token="benchmark", created_at=now,
+                    expires_at=now + timedelta(days=-7 if i < count // 2 else 7),
+                )
+                for i in numbers
+            ])
+            BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens[::2]])
+
+
+def token_refresh(iterations):
+    user = User.objects.get(email=STUDENT_EMAIL)
+    refresh_tokens = [str(RefreshToken.for_user(user)) for _ in range(iterations)]
+    client = APIClient()
+    timings, queries, sizes, status_codes = [], [], [], set()
+    for refresh in refresh_tokens:
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.post("/auth/refresh/", {"refresh": refresh}, format='json')
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        sizes.append(len(response.content))
+        status_codes.add(response.status_code)
+    return {
+        'path': "/auth/refresh/",
+        'p50_ms': round(percentile(timings, 0.50), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'queries': max(queries),
+        'bytes': max(sizes),
+        'status': sorted(status_codes),
+    }
+
+
+def prune_tokens():
+    started = time.perf_counter()
+    deleted = prune_expired()
+    return {'deleted': deleted, 'seconds': round(time.perf_counter() - started, 2)}
+
+
+def password_hash(iterations=5):
+    """p50 milliseconds of one password check with the default hasher."""
+    encoded = make_password(PASSWORD)
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        check_password(PASSWORD, encoded)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'algorithm': get_hasher().algorithm, 'p50_ms': round(percentile(timings, 0.50), 2)}
+
+
+def write_throughput(writers, transactions):
+    """
+    Commit `transactions` write transactions from each of `writers` threads
+    and return the committed transactions per second and the failures.
+    """
+    failures = []
+    barrier = threading.Barrier(writers + 1)
+
+    def work(n):
+        barrier.wait()
+        try:
+            for i in range(transactions):
+                try:
+                    # Read then write, like a sign-up checking the committee before joining it
+                    with transaction.atomic():
+                        Institution.objects.filter(name__startswith="Benchmark ").count()
+                        institution = Institution.objects.create(name=f"Benchmark {n}-{i}", city="Benchmark")
+                        institution.delete()
+                except Exception as e:
+                    failures.append(str(e))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    committed = writers * transactions - len(failures)
+    return {
+        'vendor': connection.vendor,
+        'writers': writers,
+        'transactions': committed,
+        'per_second': round(committed / elapsed, 1),
+        'failures': len(failures),
+    }
+
+
+def regressions(results, baseline, threshold):
+    """
+    Messages for every scenario whose p95 latency or query count grew by more
+    than `threshold` (a fraction) over the baseline. Query counts must not
+    grow at all past the threshold, rounded down, so 10% of 3 queries is 0.
+    """
+    messages = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            messages.append(f"{name}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms")
+        if result['queries'] > previous['queries'] + int(previous['queries'] * threshold):
+            messages.append(f"{name}: queries {previous['queries']} -> {result['queries']}")
+    return messages
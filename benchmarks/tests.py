@@ -0,0 +1,55 @@
+from django.test import TestCase
+
+from benchmarks import runner
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from users.models import User
+from semesters.models import Semester
+from tracks.models import Track
+from datetime import date, time, timedelta
+
+
+class BenchmarkRunnerTests(TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(runner.percentile(values, 0.50), 50)
+        self.assertEqual(runner.percentile(values, 0.95), 95)
+        self.assertEqual(runner.percentile([7], 0.95), 7)
+
+    def test_regressions(self):
+        baseline = {'tracks': {'p95_ms': 10.0, 'queries': 3}, 'gone': {'p95_ms': 1.0, 'queries': 1}}
+        self.assertEqual(runner.regressions({'tracks': {'p95_ms': 11.9, 'queries': 3}}, baseline, 0.2), [])
+        self.assertEqual(
+            runner.regressions({'tracks': {'p95_ms': 12.5, 'queries': 4}}, baseline, 0.2),
+            ["tracks: p95 10.0ms -> 12.5ms", "tracks: queries 3 -> 4"],
+        )
+
+    def test_token_benchmarks(self):
+        User.objects.create_user(email=runner.STUDENT_EMAIL, full_name="Student", password=runner.PASSWORD, role="student")
+        runner.seed_outstanding_tokens(10, batch_size=4)
+        self.assertEqual((OutstandingToken.objects.count(), BlacklistedToken.objects.count()), (10, 5))
+
+        result = runner.token_refresh(iterations=2)
+        self.assertEqual(result['status'], [200])
+        self.assertEqual(runner.prune_tokens()['deleted'], 5)
+
+    def test_password_hash(self):
+        result = runner.password_hash(iterations=2)
+        self.assertTrue(result['algorithm'])
+        self.assertGreaterEqual(result['p50_ms'], 0)
+
+    def test_run_scenario(self):
+        semester = Semester.objects.create(
+            name="Spring 2025", start_date=date(2025, 2, 1), end_date=date(2025, 6, 30),
+            int_presentation_date=date(2025, 6, 15), last_presentation_date=date(2025, 6, 20),
+            daily_start_time=time(8, 0), daily_end_time=time(18, 0),
+            pre_duration=timedelta(minutes=45), min_committees=3, max_committees=5,
+        )
+        Track.objects.create(title="Track", semester=semester)
+
+        result = runner.run_scenario(None, 'get', "/tracks/", None, iterations=3)
+
+        self.assertEqual(result['status'], [200])
+        # Measured uncached, though the warmup request would fill the response cache
+        self.assertEqual(result['queries'], 1)
+        self.assertGreater(result['bytes'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p95_ms'])
@@ -42,7 +42,7 @@ class CommitteeViewSetTests(APITestCase):
     def test_list_uses_committee_serializer(self):
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('role', response.data[0])
+        self.assertIn('role', response.data['results'][0])
 
     def test_retrieve_uses_committee_serializer(self):
         response = self.client.get(self.detail_url)
@@ -1,9 +1,11 @@
 from rest_framework import viewsets, permissions
 from .models import Committee
 from .serializers import CommitteeSerializer, AssignCommitteeRoleSerializer
+from backend.instrumentation import SerializeTimingMixin
 
-class CommitteeViewSet(viewsets.ModelViewSet):
+class CommitteeViewSet(SerializeTimingMixin, viewsets.ModelViewSet):
     queryset = Committee.objects.all()
+    ordering = ('id',)
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Institution
+from backend import response_cache
+
+@receiver(post_save, sender=Institution)
+@receiver(post_delete, sender=Institution)
+def invalidate_institution_responses(sender, instance, **kwargs):
+    response_cache.invalidate(response_cache.INSTITUTIONS)
@@ -1,13 +1,26 @@
 from rest_framework import viewsets, permissions
 from .models import Institution
 from .serializers import InstitutionSerializer
+from backend.pagination import AdminLimitOffsetPagination
+from backend.response_cache import cached_response, INSTITUTIONS
+from backend.instrumentation import SerializeTimingMixin
 
-class InstitutionViewSet(viewsets.ModelViewSet):
+class InstitutionViewSet(SerializeTimingMixin, viewsets.ModelViewSet):
     queryset = Institution.objects.all().order_by('name')
     serializer_class = InstitutionSerializer
+    pagination_class = AdminLimitOffsetPagination
+    ordering = ('name', 'id')
 
     # Optional: restrict modifications to staff/admin only
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [permissions.IsAdminUser()]
         return [permissions.AllowAny()]
+
+    @cached_response(INSTITUTIONS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response(INSTITUTIONS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -2,8 +2,11 @@ from .models import Profile
 from rest_framework import generics, permissions, viewsets
 from .serializers import ProfileReadSerializer, ProfileSerializer
 from rest_framework.permissions import IsAdminUser
+from backend.pagination import AdminLimitOffsetPagination
+from backend.upload_handlers import StreamingUploadMixin
+from backend.instrumentation import SerializeTimingMixin
 
-class MyProfileView(generics.RetrieveUpdateAPIView):
+class MyProfileView(SerializeTimingMixin, StreamingUploadMixin, generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
@@ -15,9 +18,11 @@ class MyProfileView(generics.RetrieveUpdateAPIView):
             return ProfileReadSerializer
         return ProfileSerializer
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(SerializeTimingMixin, StreamingUploadMixin, viewsets.ModelViewSet):
     queryset = Profile.objects.all()
     permission_classes = [IsAdminUser]
+    pagination_class = AdminLimitOffsetPagination
+    ordering = ('user_id',)
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SemesterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'semesters'
+
+    def ready(self):
+        import semesters.signals
@@ -0,0 +1,75 @@
+from bisect import bisect_right
+from itertools import accumulate
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Semester
+
+# Bumped on every Semester write, once it commits. Workers compare it with the
+# generation their in-process index was built from, so a write in one process
+# reaches the others whenever the cache backend is shared. Bumped before the
+# commit, a concurrent reader could rebuild from the old rows under the new
+# generation and keep them until the next write.
+GENERATION_KEY = 'semesters:index:generation'
+
+_index = None
+_index_generation = None
+
+
+class SemesterIndex:
+    """
+    All semesters sorted by start date, answering "which semester contains
+    this date?" with one bisect and "which semester has this id?" with a dict
+    lookup, without touching the database.
+    """
+
+    def __init__(self, semesters):
+        self.semesters = sorted(semesters, key=lambda semester: (semester.start_date, semester.pk))
+        self.starts = [semester.start_date for semester in self.semesters]
+        # max_ends[i] is the latest end date among the first i + 1 semesters
+        self.max_ends = list(accumulate((semester.end_date for semester in self.semesters), max))
+        self.by_id = {semester.pk: semester for semester in self.semesters}
+
+    def get(self, semester_id):
+        return self.by_id.get(semester_id)
+
+    def containing(self, day):
+        """The latest-starting semester whose date range includes `day`, or None."""
+        i = bisect_right(self.starts, day)
+        # Walk back only while an earlier semester could still reach `day`
+        while i > 0 and self.max_ends[i - 1] >= day:
+            i -= 1
+            if self.semesters[i].end_date >= day:
+                return self.semesters[i]
+        return None
+
+
+def _current_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid4().hex, None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def get_semester_index():
+    """Return the process-wide index, rebuilding it after any Semester write."""
+    global _index, _index_generation
+    generation = _current_generation()
+    if _index is None or generation != _index_generation:
+        _index = SemesterIndex(Semester.objects.all())
+        _index_generation = generation
+    return _index
+
+
+def _bump():
+    global _index
+    _index = None
+    cache.set(GENERATION_KEY, uuid4().hex, None)
+
+
+def invalidate():
+    """Rebuild the index in every process once the current transaction commits."""
+    transaction.on_commit(_bump)
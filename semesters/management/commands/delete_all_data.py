@@ -1,26 +1,94 @@
+from graphlib import TopologicalSorter
+
 from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
 from django.apps import apps
+from django.db import connection
+
+from backend import response_cache
+from semesters import index
+from semesters.models import Semester
+from tribunals import schedule
+
+# app_label.model_name seeded by seed_all
+SEEDED_MODELS = [
+    ('institutions', 'Institution'),
+    ('semesters', 'Semester'),
+    ('users', 'User'),
+    ('tracks', 'Track'),
+    ('slots', 'Slot'),
+    ('tfms', 'TFM'),
+    ('tribunals', 'Tribunal'),
+]
+
+
+def _references(model):
+    """Models the given model points at through a foreign key or one-to-one field."""
+    return {
+        field.related_model for field in model._meta.concrete_fields
+        if field.many_to_one or field.one_to_one
+    }
+
+
+def deletion_order(models):
+    """
+    The given models plus every model (M2M tables included) that references
+    them, directly or not, ordered so each model comes before the ones it
+    references.
+    """
+    models = set(models)
+    candidates = apps.get_models(include_auto_created=True)
+    while True:
+        referencing = {model for model in candidates if model not in models and _references(model) & models}
+        if not referencing:
+            break
+        models |= referencing
+
+    graph = {model: (_references(model) & models) - {model} for model in models}
+    return list(reversed(list(TopologicalSorter(graph).static_order())))
+
 
 class Command(BaseCommand):
     help = "Delete all data from only the models seeded by seed_all. Use with caution!"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fast', action='store_true',
+            help="Empty the tables with TRUNCATE (PostgreSQL) or plain DELETEs (SQLite) and reset their sequences, "
+                 "skipping Django's per-object cascade collection",
+        )
+
     def handle(self, *args, **options):
+        models = deletion_order(apps.get_model(app_label, model_name) for app_label, model_name in SEEDED_MODELS)
+        semester_ids = list(Semester.objects.values_list('pk', flat=True))
+        if options['fast']:
+            self.truncate(models)
+        else:
+            self.delete(models)
+        # A flush sends no signals at all, and queryset deletes none for M2M rows.
+        # Sequences restart too, so new rows would pick up what was cached for the old ids.
+        response_cache.invalidate_all()
+        index.invalidate()
+        schedule.invalidate(*semester_ids)
+
+    def delete(self, models):
         self.stdout.write(self.style.WARNING("⚠️ Deleting all data from selected models..."))
-        # List of app_label.model_name to delete, in dependency-safe order
-        models_to_delete = [
-            ('institutions', 'Institution'),
-            ('semesters', 'Semester'),
-            ('users', 'User'),
-            ('tracks', 'Track'),
-            ('slots', 'Slot'),
-            ('tfms', 'TFM'),
-            ('tribunals', 'Tribunal'),
-        ]
-        for app_label, model_name in models_to_delete:
+        seeded = {apps.get_model(app_label, model_name) for app_label, model_name in SEEDED_MODELS}
+        # Dependents first, so PROTECTed references are gone before their targets
+        for model in [model for model in models if model in seeded]:
+            label = f"{model._meta.app_label}.{model.__name__}"
             try:
-                model = apps.get_model(app_label, model_name)
                 deleted, _ = model.objects.all().delete()
-                self.stdout.write(self.style.NOTICE(f"Deleted {deleted} objects from {app_label}.{model_name}"))
+                self.stdout.write(self.style.NOTICE(f"Deleted {deleted} objects from {label}"))
             except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Error deleting from {app_label}.{model_name}: {e}"))
+                self.stdout.write(self.style.ERROR(f"Error deleting from {label}: {e}"))
         self.stdout.write(self.style.SUCCESS("✅ Selected data deleted."))
+
+    def truncate(self, models):
+        tables = [model._meta.db_table for model in models]
+        self.stdout.write(self.style.WARNING(f"⚠️ Emptying {len(tables)} tables..."))
+        # The same statements `manage.py flush` uses: TRUNCATE ... RESTART IDENTITY
+        # CASCADE on PostgreSQL, DELETE FROM plus sqlite_sequence resets on SQLite.
+        sql_list = connection.ops.sql_flush(no_style(), tables, reset_sequences=True, allow_cascade=True)
+        connection.ops.execute_sql_flush(sql_list)
+        self.stdout.write(self.style.SUCCESS(f"✅ Emptied {', '.join(tables)}."))
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from semesters.models import Semester
+from slots.generator import DEFAULT_MAX_TFMS, generate_slots
+from tracks.models import Track
+
+
+class Command(BaseCommand):
+    help = "Generate the slots of a semester from a daily template of start times"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, required=True, help="Semester id")
+        parser.add_argument('--track', type=int, action='append', dest='tracks',
+                            help="Track id, repeatable (defaults to every track of the semester)")
+        parser.add_argument('--room', action='append', dest='rooms', help="Room, repeatable")
+        parser.add_argument('--time', action='append', dest='times', help="Start time as HH:MM, repeatable")
+        parser.add_argument('--max-tfms', type=int, default=DEFAULT_MAX_TFMS)
+        parser.add_argument('--dry-run', action='store_true', help="Count the slots without creating them")
+
+    def handle(self, *args, **options):
+        semester = Semester.objects.filter(pk=options['semester']).first()
+        if not semester:
+            raise CommandError("Semester not found")
+
+        tracks = Track.objects.filter(semester=semester).order_by('id')
+        if options['tracks']:
+            tracks = tracks.filter(pk__in=options['tracks'])
+        tracks = list(tracks)
+        if not tracks:
+            raise CommandError("No tracks to generate slots for")
+
+        try:
+            times = [datetime.strptime(value, "%H:%M").time() for value in options['times'] or []]
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        result = generate_slots(
+            semester, tracks, rooms=options['rooms'], times=times,
+            max_tfms=options['max_tfms'], dry_run=options['dry_run'],
+        )
+        verb = "Would create" if options['dry_run'] else "Created"
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {verb} {result['created']} slots, skipped {result['skipped']}"))
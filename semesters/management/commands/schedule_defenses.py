@@ -0,0 +1,46 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from rest_framework.exceptions import ValidationError
+
+from semesters.models import Semester
+from tribunals import scheduler
+
+
+class Command(BaseCommand):
+    help = "Assign the approved, unscheduled TFMs of a semester to its slots"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, help="Semester id (defaults to the current semester)")
+        parser.add_argument('--dry-run', action='store_true', help="Print the planned tribunals without creating them")
+
+    def handle(self, *args, **options):
+        if options['semester']:
+            semester = Semester.objects.filter(pk=options['semester']).first()
+        else:
+            semester = Semester.objects.filter(start_date__lte=date.today(), end_date__gte=date.today()).first()
+        if not semester:
+            self.stdout.write(self.style.ERROR("❌ Semester not found"))
+            return
+
+        assignments, unassigned = scheduler.plan_defenses(semester)
+
+        for assignment in assignments:
+            self.stdout.write(
+                f"+ TFM {assignment['tfm']} \"{assignment['title']}\" → slot {assignment['slot']} "
+                f"#{assignment['index']} {assignment['room']} "
+                f"{assignment['start']:%Y-%m-%d %H:%M}-{assignment['end']:%H:%M}"
+            )
+        for item in unassigned:
+            self.stdout.write(self.style.WARNING(f"! TFM {item['tfm']} \"{item['title']}\": {item['reason']}"))
+
+        if options['dry_run']:
+            self.stdout.write(f"Dry run: {len(assignments)} tribunals planned, {len(unassigned)} TFMs left out")
+            return
+
+        try:
+            scheduler.apply_plan(assignments)
+        except ValidationError as exc:
+            self.stdout.write(self.style.ERROR(f"❌ Nothing created: {exc.detail}"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"✅ Created {len(assignments)} tribunals"))
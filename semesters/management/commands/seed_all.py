@@ -2,12 +2,25 @@ from django.core.management.base import BaseCommand
 from django.core import management
 import time
 
+from backend import response_cache
+
 class Command(BaseCommand):
     help = "Seed the full database: users, semesters, institutions, tracks, slots, TFMs, tribunals"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int,
+            help="Seed a large synthetic dataset instead of the demo TFMs (10 = 10k students, 1k teachers, 5k TFMs)",
+        )
+
     def handle(self, *args, **kwargs):
         self.stdout.write(self.style.NOTICE("🚀 Starting full data seed..."))
+        self.seed(kwargs['scale'])
+        # Several seeders bulk insert, which sends no signals
+        response_cache.invalidate_all()
+        self.stdout.write(self.style.SUCCESS("✅ All data successfully seeded."))
 
+    def seed(self, scale):
         self.stdout.write(self.style.NOTICE("🏛️ Seeding institutions..."))
         management.call_command("seed_institutions")
 
@@ -23,10 +36,13 @@ class Command(BaseCommand):
         self.stdout.write(self.style.NOTICE("📚 Seeding slots..."))
         management.call_command("seed_slots")
 
+        if scale:
+            self.stdout.write(self.style.NOTICE(f"🏗️ Bulk seeding at scale {scale}..."))
+            management.call_command("seed_bulk", scale=scale)
+            return
+
         self.stdout.write(self.style.NOTICE("📝 Seeding TFMs..."))
         management.call_command("seed_tfms")
 
         self.stdout.write(self.style.NOTICE("🏛️ Seeding tribunals..."))
         management.call_command("seed_tribunals")
-
-        self.stdout.write(self.style.SUCCESS("✅ All data successfully seeded."))
@@ -0,0 +1,120 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from reportlab.pdfgen import canvas
+from io import BytesIO
+from datetime import datetime, time
+import random
+
+from django.utils import timezone
+from institutions.models import Institution
+from profiles.models import Profile
+from semesters.models import Semester
+from tfms.models import TFM
+from tribunals import scheduler, staffing
+from users.models import User
+
+# Rows per unit of --scale; --scale 10 gives 10k students, 1k teachers and 5k TFMs
+STUDENTS_PER_SCALE = 1000
+TEACHERS_PER_SCALE = 100
+TFMS_PER_SCALE = 500
+BATCH_SIZE = 1000
+EMAIL_PREFIX = "bulk."
+
+
+class Command(BaseCommand):
+    help = "Seed a large synthetic dataset with bulk inserts: users, TFMs, tribunals and committees"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help="Dataset size multiplier (1 = 1k students)")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed, for reproducible datasets")
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        rng = random.Random(options['seed'])
+
+        institutions = list(Institution.objects.all())
+        semesters = list(Semester.objects.order_by('start_date'))
+        if not institutions or not semesters:
+            self.stdout.write(self.style.ERROR("❌ Seed institutions and semesters first"))
+            return
+
+        teachers = self.seed_users(User.TEACHER, TEACHERS_PER_SCALE * scale, institutions)
+        students = self.seed_users(User.STUDENT, STUDENTS_PER_SCALE * scale, institutions)
+        self.stdout.write(self.style.SUCCESS(f"✅ {len(teachers)} teachers and {len(students)} students"))
+
+        created = self.seed_tfms(TFMS_PER_SCALE * scale, students, teachers, semesters, rng)
+        self.stdout.write(self.style.SUCCESS(f"✅ Created {created} TFMs"))
+
+        for semester in semesters:
+            assignments, unassigned = scheduler.plan_defenses(semester)
+            scheduler.apply_plan(assignments)
+            members, unstaffed = staffing.plan_committees(semester)
+            staffing.apply_plan(semester, members)
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {semester.name}: {len(assignments)} tribunals ({len(unassigned)} TFMs without a slot), "
+                f"{len(members)} committee members ({len(unstaffed)} roles left empty)"
+            ))
+
+    def seed_users(self, role, count, institutions):
+        """
+        Create the missing bulk.<role><n>@example.com users with their profiles.
+        Every user shares one password hash, computed once.
+        """
+        emails = [f"{EMAIL_PREFIX}{role}{i}@example.com" for i in range(1, count + 1)]
+        existing = set(User.objects.filter(email__startswith=f"{EMAIL_PREFIX}{role}").values_list('email', flat=True))
+        password = make_password("pass1234")
+
+        users = [
+            User(email=email, full_name=f"{role.title()} {i}", role=role, password=password)
+            for i, email in enumerate(emails, start=1) if email not in existing
+        ]
+        with transaction.atomic():
+            users = User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+            # bulk_create sends no post_save, so create the profiles the signal would
+            Profile.objects.bulk_create([
+                Profile(user=user, institution=institutions[i % len(institutions)] if role == User.TEACHER else None)
+                for i, user in enumerate(users)
+            ], batch_size=BATCH_SIZE)
+
+        return list(User.objects.filter(email__startswith=f"{EMAIL_PREFIX}{role}").values_list('id', flat=True))
+
+    def seed_tfms(self, count, students, teachers, semesters, rng):
+        """Create `count` TFMs spread evenly over the semesters, all pointing at one shared PDF."""
+        existing = TFM.objects.filter(title__startswith="Bulk TFM ").count()
+        if existing >= count:
+            return 0
+
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer)
+        pdf.drawString(100, 750, "Synthetic TFM for load testing")
+        pdf.save()
+        file_name = default_storage.save("tfms/bulk_tfm.pdf", ContentFile(buffer.getvalue()))
+
+        numbers = range(existing + 1, count + 1)
+        with transaction.atomic():
+            tfms = TFM.objects.bulk_create([
+                TFM(
+                    title=f"Bulk TFM {i}", description=f"Description for Bulk TFM {i}", file=file_name,
+                    author_id=students[i % len(students)], status='approved',
+                )
+                for i in numbers
+            ], batch_size=BATCH_SIZE)
+
+            TFM.directors.through.objects.bulk_create([
+                TFM.directors.through(tfm_id=tfm.pk, user_id=director)
+                for tfm in tfms
+                for director in rng.sample(teachers, k=rng.randint(1, 2))
+            ], batch_size=BATCH_SIZE)
+
+            # created_at is auto_now_add, so move each share into its semester afterwards
+            share = -(-len(tfms) // len(semesters))
+            for n, semester in enumerate(semesters):
+                ids = [tfm.pk for tfm in tfms[n * share:(n + 1) * share]]
+                created_at = timezone.make_aware(datetime.combine(semester.start_date, time(12, 0)))
+                for start in range(0, len(ids), BATCH_SIZE):
+                    TFM.objects.filter(pk__in=ids[start:start + BATCH_SIZE]).update(created_at=created_at)
+
+        return len(tfms)
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from institutions.models import Institution
 
 User = get_user_model()
@@ -41,15 +42,18 @@ class Command(BaseCommand):
         else:
             self.stdout.write("⚠️ Admin user already exists")
 
+        # Hash the shared seed password once instead of once per user
+        password = make_password("pass1234")
+
         # Teachers
         for i in range(1, 21):
             email = f"teacher{i}@example.com"
             if not User.objects.filter(email=email).exists():
-                user = User.objects.create_user(
+                user = User.objects.create(
                     email=email,
                     full_name=f"Dr. Teacher {i}",
                     role=User.TEACHER,
-                    password="pass1234"
+                    password=password
                 )
                 institution = institutions[(i - 1) % len(institutions)]
                 profile, _ = user.profile.__class__.objects.get_or_create(user=user)
@@ -61,11 +65,11 @@ class Command(BaseCommand):
         for i in range(1, 51):
             email = f"student{i}@example.com"
             if not User.objects.filter(email=email).exists():
-                User.objects.create_user(
+                User.objects.create(
                     email=email,
                     full_name=f"Student {i}",
                     role=User.STUDENT,
-                    password="pass1234"
+                    password=password
                 )
                 created_students += 1
 
@@ -0,0 +1,42 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+
+from semesters.models import Semester
+from tribunals import staffing
+
+
+class Command(BaseCommand):
+    help = "Fill the missing committee roles of every tribunal in a semester"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semester', type=int, help="Semester id (defaults to the current semester)")
+        parser.add_argument('--dry-run', action='store_true', help="Print the planned members without creating them")
+
+    def handle(self, *args, **options):
+        if options['semester']:
+            semester = Semester.objects.filter(pk=options['semester']).first()
+        else:
+            semester = Semester.objects.filter(start_date__lte=date.today(), end_date__gte=date.today()).first()
+        if not semester:
+            self.stdout.write(self.style.ERROR("❌ Semester not found"))
+            return
+
+        assignments, unstaffed = staffing.plan_committees(semester)
+
+        for item in assignments:
+            self.stdout.write(f"+ tribunal {item['tribunal']}: user {item['user']} as {item['role']}")
+        for item in unstaffed:
+            self.stdout.write(self.style.WARNING(f"! tribunal {item['tribunal']}: no {item['role']} ({item['reason']})"))
+
+        if options['dry_run']:
+            self.stdout.write(f"Dry run: {len(assignments)} members planned, {len(unstaffed)} roles left empty")
+            return
+
+        try:
+            staffing.apply_plan(semester, assignments)
+        except serializers.ValidationError:
+            self.stdout.write(self.style.ERROR(f"❌ {staffing.CHANGED}"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"✅ Created {len(assignments)} committee members"))
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Semester
+from . import index
+from backend import response_cache
+
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def invalidate_semester_index(sender, instance, **kwargs):
+    index.invalidate()
+    response_cache.invalidate(response_cache.SEMESTERS)
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -12,6 +13,8 @@ User = get_user_model()
 
 class SemesterTests(TestCase):
     def setUp(self):
+        # The semester index and schedules are keyed by ids these tests reuse
+        cache.clear()
         self.client = APIClient()
         self.semester = Semester.objects.create(
             name="Spring 2025",
@@ -249,3 +252,138 @@ class SemesterTests(TestCase):
         self.assertEqual(response.status_code, 204)
         self.assertFalse(Semester.objects.filter(id=semester2.id).exists())
 
+    # ─────────────────────────────────────────
+    # 📁 Semester Index
+    # ─────────────────────────────────────────
+    def test_index_finds_semester_containing_date(self):
+        from .index import SemesterIndex
+        fall = Semester(
+            pk=99, name="Fall 2025", start_date=date(2025, 9, 1), end_date=date(2026, 1, 31),
+            int_presentation_date=date(2026, 1, 12), last_presentation_date=date(2026, 1, 16)
+        )
+        index = SemesterIndex([fall, self.semester])
+        self.assertEqual(index.containing(date(2025, 3, 1)), self.semester)
+        self.assertEqual(index.containing(date(2025, 5, 10)), self.semester)
+        self.assertEqual(index.containing(date(2025, 12, 1)), fall)
+        self.assertIsNone(index.containing(date(2025, 7, 1)))
+        self.assertIsNone(index.containing(date(2024, 1, 1)))
+        self.assertEqual(index.get(99), fall)
+
+    def test_index_is_reused_and_rebuilt_on_write(self):
+        from .index import get_semester_index
+        get_semester_index()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_semester_index().get(self.semester.id).name, "Spring 2025")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.semester.name = "Spring 2025 (renamed)"
+            self.semester.save()
+            # Rebuilt once the write commits, never from rows other readers cannot see yet
+            self.assertEqual(get_semester_index().get(self.semester.id).name, "Spring 2025")
+        self.assertEqual(get_semester_index().get(self.semester.id).name, "Spring 2025 (renamed)")
+
+    # ─────────────────────────────────────────
+    # 🌱 Bulk seeding
+    # ─────────────────────────────────────────
+    def test_seed_bulk(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from institutions.models import Institution
+        from profiles.models import Profile
+        from slots.models import Slot
+        from tfms.models import TFM
+        from tracks.models import Track
+        from tribunals.models import Tribunal
+        from committees.models import Committee
+
+        Institution.objects.create(name="UB", city="Barcelona")
+        track = Track.objects.create(title="Track", semester=self.semester)
+        Slot.objects.create(track=track, date=date(2025, 5, 19), start_time=time(10, 0),
+                            end_time=time(13, 0), room="A1", max_tfms=4)
+
+        call_command("seed_bulk", scale=1, stdout=StringIO())
+
+        bulk_users = User.objects.filter(email__startswith="bulk.")
+        self.assertEqual(bulk_users.filter(role="student").count(), 1000)
+        self.assertEqual(bulk_users.filter(role="teacher").count(), 100)
+        self.assertEqual(Profile.objects.filter(user__in=bulk_users).count(), 1100)
+        self.assertTrue(bulk_users.first().check_password("pass1234"))
+        self.assertEqual(TFM.objects.count(), 500)
+        self.assertFalse(TFM.objects.filter(directors__isnull=True).exists())
+        self.assertEqual(Tribunal.objects.count(), 4)
+        self.assertEqual(Committee.objects.count(), 12)
+
+        call_command("seed_bulk", scale=1, stdout=StringIO())
+        self.assertEqual(User.objects.filter(email__startswith="bulk.").count(), 1100)
+        self.assertEqual(TFM.objects.count(), 500)
+
+    # ─────────────────────────────────────────
+    # 🧹 Data reset
+    # ─────────────────────────────────────────
+    def seed_small_tree(self):
+        from institutions.models import Institution
+        from slots.models import Slot
+        from tfms.models import TFM
+        from tracks.models import Track
+        from tribunals.models import Tribunal
+
+        Institution.objects.create(name="UB", city="Barcelona")
+        track = Track.objects.create(title="Track", semester=self.semester)
+        slot = Slot.objects.create(track=track, date=date(2025, 5, 19), start_time=time(10, 0),
+                                   end_time=time(13, 0), room="A1", max_tfms=4)
+        tfm = TFM.objects.create(title="T", description="d", file="tfms/t.pdf", author=self.user)
+        tfm.directors.set([self.admin])
+        tribunal = Tribunal.objects.create(tfm=tfm, slot=slot)
+        tribunal.add_committee(self.admin, "president")
+
+    def test_deletion_order_puts_dependents_first(self):
+        from django.apps import apps
+        from .management.commands.delete_all_data import SEEDED_MODELS, deletion_order
+
+        order = deletion_order(apps.get_model(*label) for label in SEEDED_MODELS)
+        position = {model: i for i, model in enumerate(order)}
+        for model in order:
+            for field in model._meta.concrete_fields:
+                if field.many_to_one and field.related_model in position and field.related_model is not model:
+                    self.assertLess(position[model], position[field.related_model], (model, field))
+        self.assertIn(apps.get_model("committees", "Committee"), position)
+
+    def test_delete_all_data(self):
+        from django.core.management import call_command
+        from io import StringIO
+
+        self.seed_small_tree()
+        out = StringIO()
+        call_command("delete_all_data", stdout=out)
+        self.assertNotIn("Error", out.getvalue())
+        self.assertFalse(Semester.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+    def test_delete_all_data_fast(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from committees.models import Committee
+        from profiles.models import Profile
+
+        from tribunals import schedule
+        from .index import get_semester_index
+
+        self.seed_small_tree()
+        semester_ids = list(Semester.objects.values_list('pk', flat=True))
+        for semester_id in semester_ids:
+            schedule.get_schedule(semester_id)
+        get_semester_index()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("delete_all_data", fast=True, stdout=StringIO())
+        self.assertEqual(cache.get_many([schedule._cache_key(semester_id) for semester_id in semester_ids]), {})
+        self.assertIsNone(get_semester_index().get(semester_ids[0]))
+        self.assertFalse(Semester.objects.exists())
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Profile.objects.exists())
+        self.assertFalse(Committee.objects.exists())
+        # Sequences start over
+        self.assertEqual(Semester.objects.create(
+            name="New", start_date=date(2025, 1, 10), end_date=date(2025, 5, 10),
+            int_presentation_date=date(2025, 5, 19), last_presentation_date=date(2025, 5, 23),
+        ).pk, 1)
@@ -2,17 +2,30 @@ from rest_framework import viewsets, permissions
 from .models import Semester
 from .serializers import SemesterSerializer
 from users.permissions import IsAdmin
+from backend.pagination import AdminLimitOffsetPagination
+from backend.response_cache import cached_response, SEMESTERS
 from rest_framework.response import Response
+from backend.instrumentation import SerializeTimingMixin
 
-class SemesterViewSet(viewsets.ModelViewSet):
+class SemesterViewSet(SerializeTimingMixin, viewsets.ModelViewSet):
     queryset = Semester.objects.all()
     serializer_class = SemesterSerializer
+    pagination_class = AdminLimitOffsetPagination
+    ordering = ('id',)
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated(), IsAdmin()]
 
+    @cached_response(SEMESTERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response(SEMESTERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         try:
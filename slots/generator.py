@@ -0,0 +1,69 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+
+from backend import response_cache
+
+from .intervals import RoomIntervals
+from .models import Slot
+
+DEFAULT_TIMES = [time(10 + i, 0) for i in range(11)]  # 10:00 to 20:00
+DEFAULT_ROOMS = [f"{prefix}{number}" for prefix in 'ABCDE' for number in (101, 102, 103, 201, 202, 203)]
+DEFAULT_MAX_TFMS = 4
+BATCH_SIZE = 500
+
+
+def generate_slots(semester, tracks, rooms=None, times=None, max_tfms=DEFAULT_MAX_TFMS, dry_run=False):
+    """
+    Create a slot for every track, presentation weekday and start time of
+    the daily template, in one transaction.
+
+    Rooms are split between the tracks in rotation and a track's slots cycle
+    through its rooms. Each slot holds as many presentations as fit before the
+    semester's daily end time, capped at max_tfms. Candidates that overlap a
+    stored slot or an earlier candidate in the same room are skipped. Every
+    conflict is resolved against one load of the semester's existing slots.
+
+    Returns {'created', 'skipped', 'by_track'}, the last mapping track id to
+    the number of slots created for it.
+    """
+    rooms = rooms or DEFAULT_ROOMS
+    times = sorted(times or DEFAULT_TIMES)
+    duration = semester.pre_duration
+    intervals = RoomIntervals.for_dates(semester.int_presentation_date, semester.last_presentation_date)
+
+    days = [
+        semester.int_presentation_date + timedelta(days=offset)
+        for offset in range((semester.last_presentation_date - semester.int_presentation_date).days + 1)
+    ]
+    weekdays = [day for day in days if day.weekday() < 5]
+
+    slots, skipped, by_track = [], 0, Counter()
+    for track_number, track in enumerate(tracks):
+        track_rooms = rooms[track_number::len(tracks)] or rooms
+        for day in weekdays:
+            day_end = datetime.combine(day, semester.daily_end_time)
+            for i, start in enumerate(times):
+                start_at = datetime.combine(day, start)
+                fitting = min((day_end - start_at) // duration, max_tfms) if start_at < day_end else 0
+                if start < semester.daily_start_time or fitting <= 0:
+                    skipped += 1
+                    continue
+                end = (start_at + duration * fitting).time()
+                room = track_rooms[i % len(track_rooms)]
+                if intervals.overlapping(day, room, start, end):
+                    skipped += 1
+                    continue
+
+                slot = Slot(track=track, date=day, start_time=start, end_time=end, room=room, max_tfms=fitting)
+                intervals.add(slot)
+                slots.append(slot)
+                by_track[track.pk] += 1
+
+    if not dry_run:
+        with transaction.atomic():
+            Slot.objects.bulk_create(slots, batch_size=BATCH_SIZE)
+        response_cache.invalidate(response_cache.SCHEDULE, semester.pk)
+
+    return {'created': len(slots), 'skipped': skipped, 'by_track': dict(by_track)}
@@ -0,0 +1,48 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from .models import Slot
+
+
+class RoomIntervals:
+    """
+    Slot times per (date, room), sorted by start time, for checking many
+    candidate slots against each other and the database with a bisect each
+    instead of one query per slot.
+
+    Slots already stored in a room never overlap (Slot.clean rejects it), so
+    their end times are sorted as well and only the slot starting right before
+    a candidate's end can overlap it.
+    """
+
+    def __init__(self, slots=()):
+        self._rooms = defaultdict(list)
+        for slot in slots:
+            self.add(slot)
+
+    @classmethod
+    def for_dates(cls, first_date, last_date):
+        """Every stored slot between the two dates, loaded in one query."""
+        return cls(Slot.objects.filter(date__range=(first_date, last_date)).only(
+            'id', 'date', 'room', 'start_time', 'end_time'
+        ))
+
+    def add(self, slot):
+        insort(self._rooms[slot.date, slot.room], (slot.start_time, slot.end_time, slot.pk), key=_times)
+
+    def overlapping(self, slot_date, room, start_time, end_time, exclude=None):
+        """The (start, end, pk) of a slot overlapping [start_time, end_time), or None."""
+        intervals = self._rooms.get((slot_date, room), ())
+        i = bisect_left(intervals, (end_time,))
+        # Step over the slot being edited, if it is the neighbour
+        while i > 0:
+            i -= 1
+            start, end, pk = intervals[i]
+            if exclude is None or pk != exclude:
+                return intervals[i] if end > start_time else None
+        return None
+
+
+def _times(interval):
+    # Unsaved candidates have no pk, so never compare on it
+    return interval[:2]
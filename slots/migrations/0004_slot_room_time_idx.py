@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slots', '0003_slot_pre_duration'),
+        ('tracks', '0002_alter_track_semester'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='slot',
+            index=models.Index(fields=['date', 'room', 'start_time', 'end_time'], name='slot_room_time_idx'),
+        ),
+    ]
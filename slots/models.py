@@ -1,8 +1,32 @@
 from django.db import models
+from django.db.models import Count, F, Prefetch
 from datetime import date
 from tracks.models import Track
 from django.core.exceptions import ValidationError
 
+class SlotQuerySet(models.QuerySet):
+    def with_tribunal_count(self):
+        if 'tribunal_count' in self.query.annotations:
+            return self
+        return self.annotate(tribunal_count=Count('tribunals'))
+
+    def not_full(self):
+        """Slots with fewer tribunals than max_tfms."""
+        return self.with_tribunal_count().filter(tribunal_count__lt=F('max_tfms'))
+
+    def overlapping(self, slot_date, room, start_time, end_time):
+        """Slots in the same room and date whose times overlap [start_time, end_time); uses slot_room_time_idx."""
+        return self.filter(date=slot_date, room=room, start_time__lt=end_time, end_time__gt=start_time)
+
+    def with_read_annotations(self):
+        """Everything SlotReadSerializer needs, including the nested TFMs, in a constant number of queries."""
+        from tribunals.models import Tribunal
+        return self.with_tribunal_count().select_related('track__semester').prefetch_related(
+            Prefetch('tribunals', queryset=Tribunal.objects.select_related('tfm__author', 'tfm__review__reviewed_by')),
+            'tribunals__tfm__directors',
+        )
+
+
 class Slot(models.Model):
     date = models.DateField()
     start_time = models.TimeField()
@@ -13,6 +37,13 @@ class Slot(models.Model):
     track = models.ForeignKey('tracks.Track', on_delete=models.PROTECT, related_name='slots')
     pre_duration = models.DurationField(null=True, blank=True)  # optional override
 
+    objects = SlotQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'room', 'start_time', 'end_time'], name='slot_room_time_idx'),
+        ]
+
     @property
     def effective_pre_duration(self):
         return self.pre_duration or self.track.semester.pre_duration
@@ -21,7 +52,11 @@ class Slot(models.Model):
         return self.tribunals.count() >= self.max_tfms
 
     def get_tfms(self):
-        return [tribunal.tfm for tribunal in self.tribunals.select_related('tfm') if tribunal.tfm]
+        if 'tribunals' in getattr(self, '_prefetched_objects_cache', {}):
+            tribunals = self.tribunals.all()
+        else:
+            tribunals = self.tribunals.select_related('tfm')
+        return [tribunal.tfm for tribunal in tribunals if tribunal.tfm]
 
     def clean(self):
         semester = self.track.semester
@@ -54,12 +89,18 @@ class Slot(models.Model):
             raise ValidationError("Slot does not have enough time to accommodate all TFMs based on the standard duration.")
         
         # ✅ Check for time overlap in the same room and date
-        overlapping = Slot.objects.filter(
-            date=self.date,
-            room=self.room,
-            start_time__lt=self.end_time,
-            end_time__gt=self.start_time,
-        )
+        if not self.overlap_checked():
+            self.check_overlap()
+
+    def overlap_key(self):
+        return (self.pk, self.date, self.room, self.start_time, self.end_time)
+
+    def overlap_checked(self):
+        """Whether SlotSerializer already ran the overlap query for these exact values."""
+        return getattr(self, '_overlap_checked', None) == self.overlap_key()
+
+    def check_overlap(self):
+        overlapping = Slot.objects.overlapping(self.date, self.room, self.start_time, self.end_time)
         if self.pk:
             overlapping = overlapping.exclude(pk=self.pk)
 
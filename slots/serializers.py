@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from .models import Slot
+from .generator import DEFAULT_MAX_TFMS
+from semesters.models import Semester
+from tracks.models import Track
 from tfms.serializers import TFMReadSerializer
 from datetime import time
 
@@ -39,18 +42,14 @@ class SlotSerializer(serializers.ModelSerializer):
             if date.weekday() >= 5:
                 raise serializers.ValidationError({'date': "Slot date cannot fall on a weekend."})
 
-        # Overlap check
+        # Overlap check; remembered so Slot.clean() does not repeat the query on save
         if start_time and end_time and room and date:
-            overlapping = Slot.objects.filter(
-                date=date,
-                room=room,
-                start_time__lt=end_time,
-                end_time__gt=start_time,
-            )
+            overlapping = Slot.objects.overlapping(date, room, start_time, end_time)
             if self.instance:
                 overlapping = overlapping.exclude(pk=self.instance.pk)
             if overlapping.exists():
                 raise serializers.ValidationError("This time slot overlaps with another slot in the same room.")
+            self._overlap_checked = (self.instance.pk if self.instance else None, date, room, start_time, end_time)
 
         # Check if time fits max TFMs
         duration = data.get('pre_duration') or track.semester.pre_duration
@@ -68,6 +67,7 @@ class SlotSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         slot = Slot(**validated_data)
+        slot._overlap_checked = getattr(self, '_overlap_checked', None)
         slot.full_clean()  # triggers model-level validation
         slot.save()
         return slot
@@ -75,6 +75,7 @@ class SlotSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
+        instance._overlap_checked = getattr(self, '_overlap_checked', None)
         instance.full_clean()
         instance.save()
         return instance
@@ -96,6 +97,9 @@ class SlotReadSerializer(serializers.ModelSerializer):
         return TFMReadSerializer(obj.get_tfms(), many=True).data
 
     def get_is_full(self, obj):
+        # Annotated by Slot.objects.with_read_annotations()
+        if hasattr(obj, 'tribunal_count'):
+            return obj.tribunal_count >= obj.max_tfms
         return obj.is_full()
 
     def get_pre_duration(self, obj):
@@ -104,3 +108,22 @@ class SlotReadSerializer(serializers.ModelSerializer):
         hours, remainder = divmod(total_seconds, 3600)
         minutes, _ = divmod(remainder, 60)
         return f"{hours:02}:{minutes:02}"
+
+
+class SlotGenerateSerializer(serializers.Serializer):
+    """Input of POST /slots/generate/; see slots.generator.generate_slots."""
+    semester = serializers.PrimaryKeyRelatedField(queryset=Semester.objects.all())
+    tracks = serializers.PrimaryKeyRelatedField(queryset=Track.objects.all(), many=True, required=False)
+    rooms = serializers.ListField(child=serializers.CharField(max_length=100), required=False, allow_empty=False)
+    times = serializers.ListField(child=serializers.TimeField(), required=False, allow_empty=False)
+    max_tfms = serializers.IntegerField(min_value=1, default=DEFAULT_MAX_TFMS)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        tracks = data.get('tracks') or list(Track.objects.filter(semester=data['semester']).order_by('id'))
+        if any(track.semester_id != data['semester'].pk for track in tracks):
+            raise serializers.ValidationError({'tracks': "Every track must belong to the semester."})
+        if not tracks:
+            raise serializers.ValidationError({'tracks': "The semester has no tracks."})
+        data['tracks'] = tracks
+        return data
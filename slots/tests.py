@@ -6,7 +6,12 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 import tempfile
 from django.core.exceptions import ValidationError
 
+from django.core.management import call_command
+from django.db import connection
+from io import StringIO
+from django.test.utils import CaptureQueriesContext
 from slots.models import Slot
+from slots.intervals import RoomIntervals
 from slots.serializers import SlotReadSerializer
 from tfms.models import TFM
 from tribunals.models import Tribunal
@@ -235,6 +240,13 @@ class SlotTests(APITestCase):
             self.slot.clean()
         self.assertIn("Slot does not have enough time to accommodate all TFMs", str(ctx.exception))
 
+    def make_semester_current(self):
+        # /slots/available/ only lists the semester running today
+        today = date.today()
+        Semester.objects.filter(pk=self.semester.pk).update(
+            start_date=today - timedelta(days=30), end_date=today + timedelta(days=30)
+        )
+
     def test_available_slots_api_returns_only_not_full(self):
         # Make self.slot full (it already has 1 tribunal and max_tfms=2)
         self.slot.max_tfms = 1
@@ -249,10 +261,11 @@ class SlotTests(APITestCase):
             date=date(2025, 6, 18),
             max_tfms=2
         )
+        self.make_semester_current()
         url = '/slots/available/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        slot_ids = [slot['id'] for slot in response.data]
+        slot_ids = [slot['id'] for slot in response.data["results"]]
         self.assertIn(slot2.id, slot_ids)
         self.assertNotIn(self.slot.id, slot_ids)
 
@@ -261,28 +274,30 @@ class SlotTests(APITestCase):
         self.slot.max_tfms = 1
         self.slot.save()
         # Do NOT add another Tribunal, as it would overfill and raise ValueError
+        self.make_semester_current()
         url = '/slots/available/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
     def test_available_slots_api_all_available(self):
         # Remove tribunals so all slots are available
         Tribunal.objects.all().delete()
+        self.make_semester_current()
         url = '/slots/available/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        slot_ids = [slot['id'] for slot in response.data]
+        slot_ids = [slot['id'] for slot in response.data["results"]]
         self.assertIn(self.slot.id, slot_ids)
 
     def test_available_slots_api_only_current_semester(self):
         # Create a slot in a different semester (not current)
         other_semester = Semester.objects.create(
             name="Other Semester",
-            start_date=date(2025, 9, 1),
-            end_date=date(2025, 12, 31),
-            int_presentation_date=date(2025, 11, 15),
-            last_presentation_date=date(2025, 11, 30),
+            start_date=date.today() + timedelta(days=200),
+            end_date=date.today() + timedelta(days=300),
+            int_presentation_date=date.today() + timedelta(days=280),
+            last_presentation_date=date.today() + timedelta(days=290),
             daily_start_time=time(9, 0),
             daily_end_time=time(18, 0),
             pre_duration=timedelta(minutes=45),
@@ -295,14 +310,15 @@ class SlotTests(APITestCase):
             start_time=time(12, 0),
             end_time=time(13, 0),
             room="B1",
-            date=date(2025, 10, 10),  # <-- ensure this is in other_semester
+            date=date.today() + timedelta(days=250),  # <-- ensure this is in other_semester
             max_tfms=2
         )
+        self.make_semester_current()
         url = '/slots/available/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        slot_ids = [slot['id'] for slot in response.data]
-        # Only slots from the current semester (May 1 - June 30, 2025) should be present
+        slot_ids = [slot['id'] for slot in response.data["results"]]
+        # Only slots from the current semester should be present
         self.assertIn(self.slot.id, slot_ids)
         self.assertNotIn(slot_other.id, slot_ids)
 
@@ -312,7 +328,8 @@ class SlotTests(APITestCase):
         url = '/slots/available/'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        # The same page envelope as when there are slots
+        self.assertEqual((response.data["results"], response.data["next"]), ([], None))
 
     def test_delete_slot_referenced_by_tribunal(self):
         """
@@ -344,3 +361,100 @@ class SlotTests(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, 204)
         self.assertFalse(Slot.objects.filter(id=slot2.id).exists())
+
+    def test_list_slots_query_count_is_constant(self):
+        teacher = User.objects.create_user(
+            email="teacher@example.com", full_name="Teacher", password="teacherpass", role=User.TEACHER
+        )
+        self.tfm.directors.set([teacher])
+        for i in range(5):
+            slot = Slot.objects.create(
+                track=self.track, start_time=time(12 + i, 0), end_time=time(12 + i, 45),
+                room="B1", date=date(2025, 6, 18), max_tfms=1
+            )
+            tfm = TFM.objects.create(
+                title=f"Thesis {i}", description="desc", file=SimpleUploadedFile(f"t{i}.pdf", b"data"),
+                author=self.student, status="approved"
+            )
+            tfm.directors.set([teacher])
+            Tribunal.objects.create(slot=slot, tfm=tfm)
+
+        self.client.logout()  # public endpoint; keeps session lookups out of the count
+        self.client.get(self.slot_url)  # warm the semester index
+        # Slots (with track and semester), tribunals (with TFM, author and review), directors
+        with self.assertNumQueries(3):
+            response = self.client.get(f"{self.slot_url}?semester={self.semester.id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertTrue(all(slot["is_full"] for slot in response.data["results"] if slot["max_tfms"] == 1))
+        self.assertTrue(all(len(slot["tfms"]) == 1 for slot in response.data["results"]))
+
+    def test_room_intervals(self):
+        first = Slot.objects.create(track=self.track, start_time=time(10, 0), end_time=time(11, 0),
+                                    room="Room 3", date=date(2025, 6, 16))
+        Slot.objects.create(track=self.track, start_time=time(12, 0), end_time=time(13, 0),
+                            room="Room 3", date=date(2025, 6, 16))
+        with self.assertNumQueries(1):
+            intervals = RoomIntervals.for_dates(date(2025, 6, 16), date(2025, 6, 16))
+
+        day = date(2025, 6, 16)
+        self.assertIsNotNone(intervals.overlapping(day, "Room 3", time(10, 30), time(11, 30)))
+        self.assertIsNotNone(intervals.overlapping(day, "Room 3", time(9, 0), time(14, 0)))
+        self.assertIsNone(intervals.overlapping(day, "Room 3", time(11, 0), time(12, 0)))
+        self.assertIsNone(intervals.overlapping(day, "Room 4", time(10, 30), time(11, 30)))
+        self.assertIsNone(intervals.overlapping(day, "Room 3", time(10, 15), time(10, 45), exclude=first.pk))
+
+        intervals.add(Slot(date=day, room="Room 3", start_time=time(11, 0), end_time=time(12, 0)))
+        self.assertIsNotNone(intervals.overlapping(day, "Room 3", time(11, 30), time(11, 45)))
+
+    def test_create_slot_checks_overlap_once(self):
+        data = {
+            "track": self.track.id, "start_time": "10:00", "end_time": "11:30",
+            "room": "Room 3", "date": "2025-06-16",
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.slot_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        overlap_queries = [q for q in queries if '"slots_slot"."room" =' in q['sql']]
+        self.assertEqual(len(overlap_queries), 1)
+
+    def test_generate_slots_endpoint(self):
+        data = {"semester": self.semester.id, "rooms": ["A1", "B1"], "times": ["10:00", "16:00"]}
+        response = self.client.post(f"{self.slot_url}generate/", {**data, "dry_run": True}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(Slot.objects.count(), 1)
+
+        response = self.client.post(f"{self.slot_url}generate/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        # 5 weekdays x 2 times, minus 10:00 on 17/06 in A1 which overlaps self.slot
+        self.assertEqual((response.data["created"], response.data["skipped"]), (9, 1))
+        afternoon = Slot.objects.get(date=date(2025, 6, 16), start_time=time(16, 0))
+        self.assertEqual((afternoon.room, afternoon.end_time, afternoon.max_tfms), ("B1", time(17, 30), 2))
+        for slot in Slot.objects.exclude(pk=self.slot.pk):
+            slot.full_clean()
+
+        # Running it again only finds conflicts
+        response = self.client.post(f"{self.slot_url}generate/", data, format="json")
+        self.assertEqual((response.data["created"], response.data["skipped"]), (0, 10))
+
+    def test_generate_slots_rejects_foreign_tracks_and_non_admins(self):
+        other_semester = Semester.objects.create(
+            name="Other", start_date=date(2025, 9, 1), end_date=date(2026, 1, 31),
+            int_presentation_date=date(2026, 1, 10), last_presentation_date=date(2026, 1, 20),
+            daily_start_time=time(9, 0), daily_end_time=time(18, 0),
+            pre_duration=timedelta(minutes=45), min_committees=3, max_committees=5,
+        )
+        other_track = Track.objects.create(title="Other", semester=other_semester)
+        response = self.client.post(f"{self.slot_url}generate/",
+                                    {"semester": self.semester.id, "tracks": [other_track.id]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.student)
+        response = self.client.post(f"{self.slot_url}generate/", {"semester": self.semester.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_generate_slots_command(self):
+        out = StringIO()
+        call_command("generate_slots", semester=self.semester.id, times=["12:00"], rooms=["C1"], stdout=out)
+        self.assertIn("Created 5 slots", out.getvalue())
+        self.assertEqual(Slot.objects.filter(room="C1").count(), 5)
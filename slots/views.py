@@ -3,7 +3,10 @@ from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Slot
-from .serializers import SlotSerializer, SlotReadSerializer
+from .serializers import SlotSerializer, SlotReadSerializer, SlotGenerateSerializer
+from .generator import generate_slots
+from backend.response_cache import cached_response, SCHEDULE
+from backend.instrumentation import SerializeTimingMixin
 
 class SlotFilter(filters.FilterSet):
     semester = filters.CharFilter(field_name="track__semester__id", lookup_expr="exact")
@@ -12,21 +15,38 @@ class SlotFilter(filters.FilterSet):
         model = Slot
         fields = ['semester']
 
-class SlotViewSet(viewsets.ModelViewSet):
+class SlotViewSet(SerializeTimingMixin, viewsets.ModelViewSet):
     queryset = Slot.objects.all()
     filter_backends = [filters.DjangoFilterBackend]
     filterset_class = SlotFilter  # Use the custom filter class
+    ordering = ('id',)
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
             return SlotReadSerializer
         return SlotSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['list', 'retrieve', 'available']:
+            return queryset.with_read_annotations()
+        return queryset
+
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [permissions.AllowAny()]
+        if self.action == 'generate':
+            return [permissions.IsAdminUser()]
         return [permissions.IsAuthenticated()]
 
+    @cached_response(SCHEDULE)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response(SCHEDULE)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=['get'], url_path='available')
     def available(self, request):
         # Get current semester (latest by start_date <= today <= end_date)
@@ -35,11 +55,25 @@ class SlotViewSet(viewsets.ModelViewSet):
         today = date.today()
         current_semester = Semester.objects.filter(start_date__lte=today, end_date__gte=today).order_by('-start_date').first()
         if not current_semester:
-            return Response([], status=200)
-        available_slots = [slot for slot in self.get_queryset().filter(track__semester=current_semester) if not slot.is_full()]
+            available_slots = Slot.objects.none()
+        else:
+            available_slots = self.get_queryset().filter(track__semester=current_semester).not_full()
+        page = self.paginate_queryset(available_slots)
+        if page is not None:
+            serializer = SlotReadSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = SlotReadSerializer(available_slots, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'])
+    def generate(self, request):
+        """Create the slots of a semester from a daily template; see slots.generator."""
+        params = SlotGenerateSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        result = generate_slots(**params.validated_data)
+        return Response(result, status=200 if params.validated_data['dry_run'] else 201)
+
     def destroy(self, request, *args, **kwargs):
         from django.db.models.deletion import ProtectedError
         try:
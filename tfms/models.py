@@ -1,6 +1,14 @@
 from django.db import models
 from django.conf import settings
 
+class TFMQuerySet(models.QuerySet):
+    def with_read_relations(self):
+        """Everything TFMReadSerializer needs, including the tribunal chain used to resolve the semester."""
+        return self.select_related(
+            'author', 'review__reviewed_by', 'tribunal__slot__track'
+        ).prefetch_related('directors')
+
+
 class TFM(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending Review'),
@@ -25,6 +33,8 @@ class TFM(models.Model):
         related_name='directed_tfms'
     )
 
+    objects = TFMQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import TFM, TFMReview
+from . import uploads
 from users.serializers import UserSerializer
-from semesters.models import Semester
+from semesters.index import get_semester_index
 from django.utils import timezone
 
 User = get_user_model()
@@ -16,23 +17,45 @@ class TFMReviewSerializer(serializers.ModelSerializer):
         fields = ['reviewed_at', 'reviewed_by', 'action', 'comment']
 
 
+class TFMUploadSerializer(serializers.Serializer):
+    """A request for a direct upload; see tfms.uploads."""
+    field = serializers.ChoiceField(choices=uploads.FIELDS, default='file')
+    filename = serializers.CharField(max_length=200)
+    size = serializers.IntegerField(min_value=1, max_value=uploads.MAX_SIZE)
+    content_type = serializers.CharField(required=False, allow_blank=True)
+
+
+class UploadedObjectSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    etag = serializers.CharField(required=False, allow_blank=True)
+
+
 class TFMSerializer(serializers.ModelSerializer):
     author = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=False)
     directors = serializers.PrimaryKeyRelatedField(queryset=User.objects.filter(role='teacher'), many=True, required=False)
     review = TFMReviewSerializer(read_only=True)
+    # Files uploaded straight to storage, instead of `file` / `attachment`
+    file_upload = UploadedObjectSerializer(write_only=True, required=False)
+    attachment_upload = UploadedObjectSerializer(write_only=True, required=False)
 
     class Meta:
         model = TFM
         fields = [
             'id', 'title', 'description', 'file', 'attachment',
             'created_at', 'status', 'author', 'directors', 'review',
+            'file_upload', 'attachment_upload',
         ]
         read_only_fields = ['status', 'created_at', 'review']
+        extra_kwargs = {'file': {'required': False}}
 
     def validate(self, attrs):
         request = self.context["request"]
         user = request.user
 
+        direct_uploads = {field: attrs.pop(f"{field}_upload", None) for field in uploads.FIELDS}
+        if not self.instance and not (attrs.get("file") or direct_uploads["file"]):
+            raise serializers.ValidationError({"file": "No file was submitted."})
+
         # Safely determine title
         title = attrs.get("title") or (self.instance.title if self.instance else None)
 
@@ -72,6 +95,11 @@ class TFMSerializer(serializers.ModelSerializer):
                     "non_field_errors": ["This TFM with same title, author, and directors already exists."]
                 })
 
+        # Last, so a confirmed upload is only used up once everything else is valid
+        for field, upload in direct_uploads.items():
+            if upload:
+                attrs[field] = uploads.confirm_upload(user, field, upload["key"], upload.get("etag"))
+
         return attrs
 
     def validate_directors(self, value):
@@ -116,14 +144,19 @@ class TFMReadSerializer(serializers.ModelSerializer):
         ]
 
     def get_semester(self, obj):
+        # Semesters are resolved from an in-process index, loaded once per serializer
+        semesters = getattr(self, '_semester_index', None)
+        if semesters is None:
+            semesters = self._semester_index = get_semester_index()
+
         # Try to get semester from related objects
         try:
-            semester = obj.tribunal.slot.track.semester
+            semester = semesters.get(obj.tribunal.slot.track.semester_id)
             if semester:
                 return str(semester)
         except AttributeError:
             pass
         # If not assigned, return current semester by created_at
         created = obj.created_at.date() if obj.created_at else timezone.now().date()
-        current = Semester.objects.filter(start_date__lte=created, end_date__gte=created).first()
+        current = semesters.containing(created)
         return str(current) if current else None
@@ -1,10 +1,18 @@
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+import base64
+import hashlib
+import json
 import tempfile
+from unittest import mock
+
+import urllib3
 
 from tfms.models import TFM
+from tfms import uploads
 from tribunals.models import Tribunal
 from slots.models import Slot
 from tracks.models import Track
@@ -21,6 +29,8 @@ class TFMTestCase(APITestCase):
                 tfm.file.delete(save=False)
 
     def setUp(self):
+        # The semester index is rebuilt on commit, which tests never reach
+        cache.clear()
         self.admin = User.objects.create_user(
             email="admin@test.com", full_name="Admin User", password="adminpass",
             role=User.TEACHER, is_staff=True
@@ -116,7 +126,7 @@ class TFMTestCase(APITestCase):
         self.client.force_authenticate(user=self.admin)
         response = self.client.get("/tfms/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data["results"]), 1)
 
     def test_student_cannot_review(self):
         self.client.force_authenticate(user=self.student)
@@ -225,7 +235,7 @@ class TFMTestCase(APITestCase):
         response = self.client.get("/tfms/pending/")
         self.assertEqual(response.status_code, 200)
 
-        titles = [item["title"] for item in response.data]
+        titles = [item["title"] for item in response.data["results"]]
         self.assertIn("Initial TFM", titles)         # from setUp, status='pending'
         self.assertNotIn("Available TFM", titles)    # status='approved'
         self.assertNotIn("Linked TFM", titles)       # status='approved'
@@ -241,7 +251,7 @@ class TFMTestCase(APITestCase):
         response = self.client.get("/tfms/available/")
         self.assertEqual(response.status_code, 200)
 
-        titles = [item["title"] for item in response.data]
+        titles = [item["title"] for item in response.data["results"]]
         self.assertIn("Available TFM", titles)
         self.assertNotIn("Linked TFM", titles)
         self.assertNotIn("Initial TFM", titles)
@@ -269,6 +279,15 @@ class TFMTestCase(APITestCase):
         data = serializer.data
         self.assertEqual(data['semester'], str(self.semester))
 
+    def test_list_tfms_resolves_semesters_without_queries(self):
+        self.client.force_authenticate(user=self.admin)
+        self.client.get("/tfms/")  # warm the semester index
+        # TFMs (with author, review and tribunal chain), directors
+        with self.assertNumQueries(2):
+            response = self.client.get("/tfms/")
+        semesters = {item["title"]: item["semester"] for item in response.data["results"]}
+        self.assertEqual(semesters["Linked TFM"], str(self.semester))
+
     '''def test_delete_tfm_blocked_by_tribunal(self):
         """Deleting a TFM referenced by a Tribunal should return a user-friendly error message."""
         self.client.force_authenticate(user=self.admin)
@@ -290,3 +309,114 @@ class TFMTestCase(APITestCase):
         self.assertEqual(response.status_code, 204)
         self.assertFalse(TFM.objects.filter(id=self.tfm.id).exists())'''
 
+
+
+class DirectUploadTestCase(APITestCase):
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(
+            email="teacher@test.com", full_name="Teacher User", password="teachpass",
+            role=User.TEACHER
+        )
+        self.student = User.objects.create_user(
+            email="student@test.com", full_name="Student User", password="studpass",
+            role=User.STUDENT
+        )
+        self.other_student = User.objects.create_user(
+            email="other@test.com", full_name="Other Student", password="studpass",
+            role=User.STUDENT
+        )
+        self.content = b"%PDF-1.4 thesis content"
+
+    def tearDown(self):
+        for tfm in TFM.objects.all():
+            if tfm.file:
+                tfm.file.delete(save=False)
+
+    def start_upload(self, user, size=None, **extra):
+        self.client.force_authenticate(user=user)
+        data = {"filename": "my thesis.pdf", "size": size or len(self.content), **extra}
+        response = self.client.post("/tfms/uploads/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def upload(self, upload, content=None):
+        fields = {**upload["fields"], "file": ("thesis.pdf", content or self.content)}
+        return urllib3.request("POST", upload["url"], fields=fields)
+
+    def create(self, user, file_upload, title="Uploaded TFM"):
+        self.client.force_authenticate(user=user)
+        data = {
+            "title": title,
+            "description": "Sent straight to storage",
+            "directors": [self.teacher.id],
+            "file_upload": file_upload,
+        }
+        return self.client.post("/tfms/", data, format="json")
+
+    def test_create_with_direct_upload(self):
+        upload = self.start_upload(self.student)
+        self.assertTrue(upload["key"].startswith("tfms/"))
+        self.assertTrue(upload["key"].endswith("/my_thesis.pdf"))
+        self.assertLess(self.upload(upload).status, 300)
+
+        response = self.create(self.student, {"key": upload["key"]})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        tfm = TFM.objects.get(id=response.data["id"])
+        self.assertEqual(tfm.file.name, upload["key"])
+        self.assertEqual(tfm.file.read(), self.content)
+
+        # A confirmed upload cannot be attached again
+        response = self.create(self.student, {"key": upload["key"]}, title="Another TFM")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file_upload", response.data)
+
+    def test_upload_larger_than_the_limit_is_refused(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.post("/tfms/uploads/", {"filename": "a.pdf", "size": 0}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # The storage enforces the limit itself, through the signed policy
+        with mock.patch.object(uploads, "MAX_SIZE", 10):
+            upload = self.start_upload(self.student, size=5)
+        policy = json.loads(base64.b64decode(upload["fields"]["policy"]))
+        self.assertIn(["content-length-range", 1, 10], policy["conditions"])
+
+    def test_size_mismatch_is_rejected(self):
+        upload = self.start_upload(self.student, size=len(self.content) + 1)
+        self.upload(upload)
+        response = self.create(self.student, {"key": upload["key"]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("expected", str(response.data["file_upload"]))
+
+    def test_missing_object_is_rejected(self):
+        upload = self.start_upload(self.student)
+        response = self.create(self.student, {"key": upload["key"]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file_upload", response.data)
+
+    def test_keys_of_other_users_are_rejected(self):
+        upload = self.start_upload(self.student)
+        self.upload(upload)
+        response = self.create(self.other_student, {"key": upload["key"]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.create(self.student, {"key": "tfms/unknown.pdf"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_etag_must_match(self):
+        upload = self.start_upload(self.student)
+        self.upload(upload)
+        response = self.create(self.student, {"key": upload["key"], "etag": '"0123"'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ETag", str(response.data["file_upload"]))
+
+        etag = hashlib.md5(self.content).hexdigest()
+        response = self.create(self.student, {"key": upload["key"], "etag": f'"{etag}"'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+
+    def test_file_or_upload_is_required(self):
+        self.client.force_authenticate(user=self.student)
+        data = {"title": "No file", "description": "Missing file", "directors": [self.teacher.id]}
+        response = self.client.post("/tfms/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file", response.data)
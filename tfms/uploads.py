@@ -0,0 +1,67 @@
+"""
+Direct-to-storage uploads for TFM files.
+
+Instead of streaming a thesis through a worker, a client:
+
+1. asks for an upload with POST /tfms/uploads/ (field, filename, size and
+   content type) and gets a pre-signed POST for a fresh object key;
+2. posts the file straight to S3/MinIO with those form fields;
+3. creates or updates the TFM with `file_upload` / `attachment_upload`
+   set to {"key": ..., "etag": ...} instead of sending the file.
+
+The storage enforces the size limit while receiving the object. On
+confirmation the object is checked to exist with the announced size (and
+ETag, when given). Keys are remembered in the cache for the life of the
+upload URL, so a user can only confirm keys issued to them.
+"""
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+from rest_framework import serializers
+
+from .models import TFM
+
+MAX_SIZE = getattr(settings, 'TFM_UPLOAD_MAX_SIZE', 200 * 1024 * 1024)
+EXPIRES_IN = getattr(settings, 'TFM_UPLOAD_EXPIRES_IN', 15 * 60)
+FIELDS = ['file', 'attachment']
+
+
+def _pending_key(key):
+    return f'tfms:upload:{key}'
+
+
+def start_upload(user, field, filename, size, content_type=None):
+    """Reserve an object key for `field` and return the pre-signed POST for it."""
+    upload_to = TFM._meta.get_field(field).upload_to
+    key = f"{upload_to}{uuid4().hex}/{get_valid_filename(filename)}"
+    post = default_storage.presigned_post(key, MAX_SIZE, EXPIRES_IN, content_type)
+    # Kept a minute longer than the URL, for uploads that finish at the deadline
+    cache.set(_pending_key(key), {'user': user.pk, 'field': field, 'size': size}, EXPIRES_IN + 60)
+    return {'key': key, 'url': post['url'], 'fields': post['fields'], 'expires_in': EXPIRES_IN}
+
+
+def confirm_upload(user, field, key, etag=None):
+    """
+    Check an uploaded object against its reservation and return the key to
+    store in the FileField. Raises ValidationError keyed by the upload field.
+    """
+    error_field = f'{field}_upload'
+    pending = cache.get(_pending_key(key))
+    if not pending or pending['user'] != user.pk or pending['field'] != field:
+        raise serializers.ValidationError({error_field: "Unknown or expired upload."})
+
+    metadata = default_storage.object_metadata(key)
+    if metadata is None:
+        raise serializers.ValidationError({error_field: "The file has not been uploaded."})
+    if metadata['size'] != pending['size']:
+        raise serializers.ValidationError(
+            {error_field: f"Uploaded {metadata['size']} bytes, expected {pending['size']}."}
+        )
+    if etag and etag.strip('"') != metadata['etag']:
+        raise serializers.ValidationError({error_field: "The uploaded file does not match its ETag."})
+
+    cache.delete(_pending_key(key))
+    return key
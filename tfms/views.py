@@ -7,8 +7,10 @@ from django_filters.rest_framework import DjangoFilterBackend
 import django_filters
 
 from .models import TFM, TFMReview
-from .serializers import TFMSerializer, TFMReadSerializer
+from .serializers import TFMSerializer, TFMReadSerializer, TFMUploadSerializer
+from . import uploads
 from users.permissions import IsStudent, IsTeacher, IsAdmin, IsAdminOrTeacher
+from backend.instrumentation import SerializeTimingMixin
 
 User = get_user_model()
 
@@ -21,12 +23,13 @@ class TFMFilter(django_filters.FilterSet):
         fields = ['semester']
 
 
-class TFMViewSet(viewsets.ModelViewSet):
+class TFMViewSet(SerializeTimingMixin, viewsets.ModelViewSet):
     queryset = TFM.objects.all()
     serializer_class = TFMSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = TFMFilter
+    ordering = ('id',)
 
     def get_serializer_class(self):
         if self.action in ['retrieve', 'list', 'my_tfms', 'pending_tfms', 'available_tfms']:
@@ -53,13 +56,18 @@ class TFMViewSet(viewsets.ModelViewSet):
         if self.action == 'my_tfms':
             user = self.request.user
             if user.role == User.STUDENT:
-                return TFM.objects.filter(author=user)
+                queryset = TFM.objects.filter(author=user)
             elif user.role == User.TEACHER:
-                return TFM.objects.filter(directors=user).distinct()
+                queryset = TFM.objects.filter(directors=user).distinct()
             elif user.is_staff or user.is_superuser:
-                return TFM.objects.all()
-            return TFM.objects.none()
-        return super().get_queryset()
+                queryset = TFM.objects.all()
+            else:
+                return TFM.objects.none()
+        else:
+            queryset = super().get_queryset()
+        if self.action in ['retrieve', 'list', 'my_tfms']:
+            return queryset.with_read_relations()
+        return queryset
 
     def perform_update(self, serializer):
         tfm = self.get_object()
@@ -122,12 +130,19 @@ class TFMViewSet(viewsets.ModelViewSet):
             'tfm_id': tfm.id,
         }, status=200)
     
+    @action(detail=False, methods=['post'], url_path='uploads')
+    def start_upload(self, request):
+        """Pre-signed POST for uploading a file straight to storage; see tfms.uploads."""
+        params = TFMUploadSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        return Response(uploads.start_upload(request.user, **params.validated_data), status=201)
+
     @action(detail=False, methods=['get'], url_path='pending')
     def pending_tfms(self, request):
         if not request.user.is_staff and not request.user.is_superuser:
             raise PermissionDenied("Only admins can access pending TFMs.")
 
-        pending = TFM.objects.filter(status='pending')
+        pending = TFM.objects.with_read_relations().filter(status='pending')
         page = self.paginate_queryset(pending)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -141,7 +156,7 @@ class TFMViewSet(viewsets.ModelViewSet):
         if not request.user.is_staff and not request.user.is_superuser:
             raise PermissionDenied("Only admins can access available TFMs.")
 
-        available = TFM.objects.filter(status='approved', tribunal__isnull=True)
+        available = TFM.objects.with_read_relations().filter(status='approved', tribunal__isnull=True)
         page = self.paginate_queryset(available)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
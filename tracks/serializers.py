@@ -10,9 +10,41 @@ class TrackSerializer(serializers.ModelSerializer):
 
 
 class TrackReadSerializer(serializers.ModelSerializer):
-    slots = SlotReadSerializer(many=True, read_only=True)
+    """
+    Track summary, optionally expanded. The `expand` context entry ({'slots'}
+    or {'slots', 'tfms'}) nests the track's slots and their TFMs; it defaults
+    to the full tree. The `fields` context entry limits the output to those
+    top-level fields.
+    """
+    slots = serializers.SerializerMethodField()
     semester = SemesterSerializer(read_only=True)
+    slot_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Track
-        fields = '__all__'
+        fields = ['id', 'title', 'semester', 'slot_count', 'slots']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'slots' not in self.expand:
+            self.fields.pop('slots')
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+    @property
+    def expand(self):
+        return self.context.get('expand', {'slots', 'tfms'})
+
+    def get_slots(self, obj):
+        serializer = SlotReadSerializer(obj.slots.all(), many=True, context=self.context)
+        if 'tfms' not in self.expand:
+            serializer.child.fields.pop('tfms')
+        return serializer.data
+
+    def get_slot_count(self, obj):
+        # Annotated by TrackViewSet.get_queryset()
+        if hasattr(obj, 'slot_count'):
+            return obj.slot_count
+        return obj.slots.count()
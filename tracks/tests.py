@@ -1,4 +1,5 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
@@ -10,6 +11,8 @@ User = get_user_model()
 
 class TrackAPITestCase(TestCase):
     def setUp(self):
+        # Cached responses are keyed by semester id, which tests reuse
+        cache.clear()
         self.client = APIClient()
 
         # Create a Semester instance
@@ -48,7 +51,7 @@ class TrackAPITestCase(TestCase):
     def test_list_tracks_public(self):
         response = self.client.get("/tracks/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data[0]["title"], "AI Track")
+        self.assertEqual(response.data["results"][0]["title"], "AI Track")
 
     def test_retrieve_track_public(self):
         response = self.client.get(f"/tracks/{self.track.id}/")
@@ -116,6 +119,7 @@ class TrackAPITestCase(TestCase):
         self.assertEqual(response.status_code, 204)
         self.assertFalse(Track.objects.filter(id=track2.id).exists())
 
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
     def test_ready_tracks_api(self):
         """
         Only tracks with at least one ready tribunal (with president, secretary, and vocal) should be returned.
@@ -153,25 +157,89 @@ class TrackAPITestCase(TestCase):
         # Should not appear yet
         response = self.client.get("/tracks/ready/")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
         # Add only president
         Committee.objects.create(tribunal=tribunal1, user=self.admin, role="president")
         response = self.client.get("/tracks/ready/")
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
         # Add secretary (different user)
         Committee.objects.create(tribunal=tribunal1, user=secretary_user, role="secretary")
         response = self.client.get("/tracks/ready/")
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
         # Add vocal (different user)
         Committee.objects.create(tribunal=tribunal1, user=vocal_user, role="vocal")
         response = self.client.get("/tracks/ready/")
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.track.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.track.id)
 
         # Remove president, should not be ready
         tribunal1.committees.filter(role="president").delete()
         response = self.client.get("/tracks/ready/")
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
+
+    def _create_slots_with_tfms(self, count):
+        from tribunals.models import Tribunal
+        from slots.models import Slot
+        from tfms.models import TFM
+        teacher = User.objects.create_user(
+            full_name="Teacher", email="teacher@test.com", password="teacherpass", role=User.TEACHER
+        )
+        for i in range(count):
+            slot = Slot.objects.create(
+                track=self.track, start_time=time(9 + i, 0), end_time=time(9 + i, 45),
+                room="A1", date=date(2025, 6, 26), max_tfms=1
+            )
+            tfm = TFM.objects.create(
+                title=f"TFM {i}", description="desc", file="tfm.pdf", status="approved", author=self.student
+            )
+            tfm.directors.set([teacher])
+            Tribunal.objects.create(tfm=tfm, slot=slot)
+
+    def test_list_tracks_returns_summaries_by_default(self):
+        self._create_slots_with_tfms(2)
+        response = self.client.get("/tracks/")
+        track = response.data["results"][0]
+        self.assertNotIn("slots", track)
+        self.assertEqual(track["slot_count"], 2)
+        self.assertEqual(track["semester"]["id"], self.semester.id)
+
+    def test_list_tracks_expand_slots(self):
+        self._create_slots_with_tfms(2)
+        response = self.client.get("/tracks/?expand=slots")
+        slots = response.data["results"][0]["slots"]
+        self.assertEqual(len(slots), 2)
+        self.assertNotIn("tfms", slots[0])
+
+        response = self.client.get("/tracks/?expand=tfms")
+        slots = response.data["results"][0]["slots"]
+        self.assertEqual(len(slots[0]["tfms"]), 1)
+
+    def test_list_tracks_fields(self):
+        response = self.client.get("/tracks/?fields=id,title")
+        self.assertEqual(set(response.data["results"][0]), {"id", "title"})
+
+    def test_retrieve_track_returns_full_tree(self):
+        self._create_slots_with_tfms(1)
+        response = self.client.get(f"/tracks/{self.track.id}/")
+        self.assertEqual(len(response.data["slots"][0]["tfms"]), 1)
+
+    def test_list_tracks_cursor_pagination(self):
+        for i in range(3):
+            Track.objects.create(title=f"Track {i}", semester=self.semester)
+        response = self.client.get("/tracks/?page_size=2")
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next"])
+
+    def test_list_tracks_expanded_query_count_is_constant(self):
+        self._create_slots_with_tfms(4)
+        self.client.get("/tracks/?expand=tfms")  # warm the semester index
+        # Semester filter lookup, tracks (with semester), slots, tribunals, directors
+        with self.assertNumQueries(5):
+            response = self.client.get(f"/tracks/?semester={self.semester.id}&expand=tfms")
+        self.assertEqual(len(response.data["results"][0]["slots"]), 4)
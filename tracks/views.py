@@ -3,24 +3,73 @@ from rest_framework import viewsets, permissions, status
 from .models import Track
 from .serializers import TrackSerializer, TrackReadSerializer
 from rest_framework.response import Response
+from django.db.models import Count, Exists, OuterRef, Prefetch
 from django.db.models.deletion import ProtectedError
 from rest_framework.decorators import action
+from slots.models import Slot
+from backend.response_cache import cached_response, SCHEDULE
+from backend.instrumentation import SerializeTimingMixin
 
-class TrackViewSet(viewsets.ModelViewSet):
+class TrackViewSet(SerializeTimingMixin, viewsets.ModelViewSet):
     queryset = Track.objects.all()
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['semester']  # enable ?semester=ID filtering
+    ordering = ('id',)
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve', 'ready']:
             return TrackReadSerializer
         return TrackSerializer
 
+    def get_expand(self):
+        """
+        Parse ?expand=slots[,tfms]. List endpoints return summaries unless
+        expanded; retrieve returns the full tree unless told otherwise.
+        """
+        param = self.request.query_params.get('expand')
+        if param is None:
+            return {'slots', 'tfms'} if self.action == 'retrieve' else set()
+        expand = {value.strip() for value in param.split(',') if value.strip()}
+        if 'tfms' in expand:
+            expand.add('slots')
+        return expand
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        fields = self.request.query_params.get('fields')
+        if fields:
+            context['fields'] = {field.strip() for field in fields.split(',') if field.strip()}
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ['list', 'retrieve', 'ready']:
+            return queryset
+
+        queryset = queryset.select_related('semester').annotate(slot_count=Count('slots'))
+        expand = self.get_expand()
+        if 'slots' in expand:
+            if 'tfms' in expand:
+                slots = Slot.objects.with_read_annotations()
+            else:
+                slots = Slot.objects.with_tribunal_count()
+            queryset = queryset.prefetch_related(Prefetch('slots', queryset=slots))
+        return queryset
+
     def get_permissions(self):
         if self.action in ['list', 'retrieve', 'ready']:
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
+    @cached_response(SCHEDULE)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response(SCHEDULE)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         try:
@@ -32,6 +81,7 @@ class TrackViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=False, methods=['get'])
+    @cached_response(SCHEDULE)
     def ready(self, request):
         """
         Returns tracks that have at least one ready tribunal (tribunal with at least one president, one secretary, and one vocal).
@@ -39,14 +89,17 @@ class TrackViewSet(viewsets.ModelViewSet):
         """
         semester = request.query_params.get("semester")
         from tribunals.models import Tribunal
-        tracks = self.queryset
+        tracks = self.get_queryset()
         if semester:
             tracks = tracks.filter(semester=semester)
-        # Only include tracks with at least one ready tribunal (using new is_ready logic)
-        ready_track_ids = set(
-            t.slot.track_id for t in Tribunal.objects.filter(slot__track__in=tracks)
-            if t.is_ready()
+        ready_tracks = tracks.filter(
+            Exists(Tribunal.objects.ready().filter(slot__track=OuterRef('pk')))
         )
-        ready_tracks = tracks.filter(id__in=ready_track_ids)
+
+        page = self.paginate_queryset(ready_tracks)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(ready_tracks, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
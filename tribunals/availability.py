@@ -0,0 +1,75 @@
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import accumulate
+
+from .models import Tribunal
+from .schedule import entry_window, get_entry
+
+
+class IntervalIndex:
+    """
+    Per-day sorted intervals answering "does [start, end) overlap any of them?"
+    with one bisect, instead of scanning every interval for every candidate.
+    """
+
+    def __init__(self, windows):
+        by_day = defaultdict(list)
+        for start, end in windows:
+            by_day[start.date()].append((start, end))
+
+        self._days = {}
+        for day, intervals in by_day.items():
+            intervals.sort()
+            starts = [start for start, _ in intervals]
+            # max_ends[i] is the latest end among the first i + 1 intervals
+            max_ends = list(accumulate((end for _, end in intervals), max))
+            self._days[day] = (starts, max_ends)
+
+    def overlaps(self, start, end):
+        day = self._days.get(start.date())
+        if not day:
+            return False
+        starts, max_ends = day
+        # Only intervals starting before `end` can overlap; of those, one does
+        # if the latest of their ends is after `start`.
+        i = bisect_left(starts, end)
+        return i > 0 and max_ends[i - 1] > start
+
+
+def user_windows(user, schedules):
+    """Return the ids and time windows of every tribunal the user is assigned to."""
+    rows = Tribunal.objects.assigned_to(user).values_list('id', 'slot__track__semester_id')
+    windows = {}
+    for tribunal_id, semester_id in rows:
+        entry = get_entry(schedules, semester_id, tribunal_id)
+        if entry is not None:
+            windows[tribunal_id] = entry_window(entry)
+    return windows
+
+
+def available_tribunals(user, semester, queryset=None):
+    """
+    Tribunals of the semester the user can still join: not full, not already
+    assigned to the user and not overlapping any of the user's own tribunals.
+
+    Time windows come from the cached semester schedules, so once those are
+    warm this runs two queries regardless of the semester size.
+    """
+    schedules = {}
+    assigned = user_windows(user, schedules)
+    busy = IntervalIndex(assigned.values())
+
+    if queryset is None:
+        queryset = Tribunal.objects.all()
+    candidates = (
+        queryset.filter(slot__track__semester=semester)
+        .exclude(pk__in=list(assigned))
+        .not_full()
+    )
+
+    available = []
+    for tribunal in candidates:
+        entry = get_entry(schedules, semester.pk, tribunal.pk)
+        if entry is not None and not busy.overlaps(*entry_window(entry)):
+            available.append(tribunal)
+    return available
@@ -0,0 +1,93 @@
+from collections import defaultdict
+from datetime import datetime, date
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from .models import Tribunal
+from . import schedule
+from backend import response_cache
+from slots.models import Slot
+from tfms.models import TFM
+
+
+def bulk_create_tribunals(items):
+    """
+    Create a tribunal for every validated {tfm, slot[, index]} item in a fixed
+    number of queries, or none of them.
+
+    Items are checked in order against one snapshot of the slots, locked until
+    commit, and against the items before them. Missing indexes get the lowest
+    free one. On failure a ValidationError carries one error dict per item,
+    empty for the items that were fine, like a `many=True` serializer.
+    """
+    tfm_ids = {item['tfm'] for item in items}
+    slot_ids = sorted({item['slot'] for item in items})
+
+    try:
+        with transaction.atomic():
+            tribunals, slots = _create(items, tfm_ids, slot_ids)
+    except IntegrityError:
+        # A concurrent request created a tribunal for one of the TFMs first.
+        raise serializers.ValidationError({"detail": "Tribunals changed while scheduling, try again."})
+
+    semester_ids = {slot.track.semester_id for slot in slots}
+    schedule.invalidate(*semester_ids)
+    response_cache.invalidate(response_cache.SCHEDULE, *semester_ids)
+    return tribunals
+
+
+def _create(items, tfm_ids, slot_ids):
+    existing_tfms = set(TFM.objects.filter(pk__in=tfm_ids).values_list('pk', flat=True))
+    scheduled_tfms = set(Tribunal.objects.filter(tfm_id__in=tfm_ids).values_list('tfm_id', flat=True))
+    slots = Slot.objects.select_for_update(of=('self',)).select_related(
+        'track__semester'
+    ).filter(pk__in=slot_ids).order_by('pk').in_bulk()
+    taken = defaultdict(set)
+    for slot_id, index in Tribunal.objects.filter(slot_id__in=slot_ids).values_list('slot_id', 'index'):
+        taken[slot_id].add(index)
+
+    tribunals, errors = [], []
+    for item in items:
+        error = _check_item(item, existing_tfms, scheduled_tfms, slots, taken)
+        errors.append(error)
+        if error:
+            continue
+        slot = slots[item['slot']]
+        index = item.get('index') or Tribunal.next_free_index(slot, taken[slot.pk])
+        taken[slot.pk].add(index)
+        scheduled_tfms.add(item['tfm'])
+        tribunals.append(Tribunal(tfm_id=item['tfm'], slot=slot, index=index))
+
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+    tribunals = Tribunal.objects.bulk_create(tribunals)
+
+    # bulk_create sends no post_save, so do once per slot what the signals
+    # and TribunalSerializer do once per tribunal.
+    affected = list(slots.values())
+    for slot in affected:
+        duration = len(taken[slot.pk]) * slot.track.semester.pre_duration
+        slot.end_time = (datetime.combine(date.today(), slot.start_time) + duration).time()
+    Slot.objects.bulk_update(affected, ['end_time'])
+    return tribunals, affected
+
+
+def _check_item(item, existing_tfms, scheduled_tfms, slots, taken):
+    if item['tfm'] not in existing_tfms:
+        return {'tfm': [f"TFM {item['tfm']} does not exist."]}
+    if item['tfm'] in scheduled_tfms:
+        return {'tfm': ["This TFM already has a tribunal."]}
+    slot = slots.get(item['slot'])
+    if slot is None:
+        return {'slot': [f"Slot {item['slot']} does not exist."]}
+    if len(taken[slot.pk]) >= slot.max_tfms:
+        return {'slot': ["This slot has reached its maximum number of TFMs."]}
+    index = item.get('index')
+    if index is not None:
+        if index < 1 or index > slot.max_tfms:
+            return {'index': [f"Index must be between 1 and {slot.max_tfms}."]}
+        if index in taken[slot.pk]:
+            return {'index': [f"Index {index} is already taken for this slot."]}
+    return {}
@@ -1,9 +1,56 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Prefetch, Q
 from tfms.models import TFM
 from slots.models import Slot
 from users.models import User
 from committees.models import Committee
 
+class TribunalQuerySet(models.QuerySet):
+    def assigned_to(self, user):
+        """Tribunals where the user sits on the committee or authored the TFM."""
+        # A subquery rather than a join on committees, so committee aggregates
+        # annotated afterwards still count every member of the tribunal.
+        return self.filter(
+            Q(pk__in=Committee.objects.filter(user=user).values('tribunal_id')) |
+            Q(tfm__author=user)
+        )
+
+    def with_committee_count(self):
+        if 'committee_count' in self.query.annotations:
+            return self
+        return self.annotate(committee_count=Count('committees'))
+
+    def with_role_counts(self):
+        """Annotate `<role>_count` for every committee role."""
+        if 'president_count' in self.query.annotations:
+            return self
+        return self.annotate(**{
+            f'{role}_count': Count('committees', filter=Q(committees__role=role))
+            for role, _ in Committee.ROLE_CHOICES
+        })
+
+    def ready(self):
+        """Tribunals with at least one president, one secretary and one vocal."""
+        return self.with_role_counts().filter(**{
+            f'{role}_count__gt': 0 for role, _ in Committee.ROLE_CHOICES
+        })
+
+    def not_full(self):
+        """Tribunals with fewer committees than their semester's max_committees."""
+        return self.with_committee_count().filter(
+            committee_count__lt=F('slot__track__semester__max_committees')
+        )
+
+    def with_read_annotations(self):
+        """Everything TribunalReadSerializer needs, in a constant number of queries."""
+        return self.with_committee_count().with_role_counts().select_related(
+            'tfm__author', 'tfm__review__reviewed_by', 'slot__track__semester'
+        ).prefetch_related(
+            'tfm__directors',
+            Prefetch('committees', queryset=Committee.objects.select_related('user')),
+        )
+
+
 class Tribunal(models.Model):
     tfm = models.OneToOneField(TFM, on_delete=models.CASCADE, unique=True)
     # Reverse relationship: You can access the Tribunal from a TFM instance using `tfm.tribunal`
@@ -12,6 +59,8 @@ class Tribunal(models.Model):
     evaluation = models.FileField(upload_to='tribunals/', null=True, blank=True)
     confirmed = models.BooleanField(default=False)
 
+    objects = TribunalQuerySet.as_manager()
+
     class Meta:
         unique_together = (('slot', 'index'),)
 
@@ -19,20 +68,35 @@ class Tribunal(models.Model):
         return f"Tribunal for {self.tfm.title}"
 
     def save(self, *args, **kwargs):
-        if self._state.adding:
-            # Only auto-assign if the index was not explicitly passed
-            if self.index == 1 and self.slot.tribunals.filter(index=1).exists():
-                existing_indexes = set(self.slot.tribunals.values_list('index', flat=True))
-                next_index = 1  # start from 1
-                while next_index in existing_indexes:
-                    next_index += 1
-
-                if next_index > self.slot.max_tfms:
-                    raise ValueError(f"Slot '{self.slot}' has reached its maximum number of TFMs.")
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
 
+        # The slot row is locked until commit, so concurrent inserts into the same
+        # slot pick their indexes one at a time. The post_save end-time update
+        # runs inside the same transaction.
+        with transaction.atomic():
+            slot = Slot.objects.select_for_update().get(pk=self.slot_id)
+            # Only auto-assign if the index was not explicitly passed
+            if self.index == 1 and slot.tribunals.filter(index=1).exists():
+                next_index = self.next_free_index(slot)
+                if next_index is None:
+                    raise ValueError(f"Slot '{slot}' has reached its maximum number of TFMs.")
                 self.index = next_index
 
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
+
+    @staticmethod
+    def next_free_index(slot, taken_indexes=None):
+        """
+        Lowest index not taken in the slot, or None if all max_tfms are used.
+        Lock the slot first, or pass the indexes already known to be taken.
+        """
+        if taken_indexes is None:
+            taken_indexes = set(slot.tribunals.values_list('index', flat=True))
+        for index in range(1, slot.max_tfms + 1):
+            if index not in taken_indexes:
+                return index
+        return None
 
     def add_committee(self, user: User, role: str):
         """Helper method to add a committee with a role."""
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Tribunal
+
+# Entries are invalidated by signals on writes; the timeout only bounds how
+# long a write that bypasses signals (bulk_create, queryset.update) can linger.
+CACHE_TIMEOUT = getattr(settings, 'TRIBUNAL_SCHEDULE_CACHE_TIMEOUT', 60 * 60)
+
+
+def tribunal_window(slot_date, start_time, index, duration):
+    """Return the (start, end) datetimes of the index-th presentation in a slot."""
+    start = datetime.combine(slot_date, start_time) + (index - 1) * duration
+    return start, start + duration
+
+
+def entry_window(entry):
+    """Return the (start, end) datetimes of a schedule entry."""
+    slot_date, start_time, end_time, _ = entry
+    return datetime.combine(slot_date, start_time), datetime.combine(slot_date, end_time)
+
+
+def _cache_key(semester_id):
+    return f'tribunals:schedule:{semester_id}'
+
+
+def build_schedule(semester_id):
+    """Map every tribunal of the semester to (date, start, end, room) in one query."""
+    rows = Tribunal.objects.filter(slot__track__semester_id=semester_id).values_list(
+        'id', 'slot__date', 'slot__start_time', 'slot__room', 'index',
+        'slot__track__semester__pre_duration',
+    )
+    schedule = {}
+    for tribunal_id, slot_date, start_time, room, index, duration in rows:
+        start, end = tribunal_window(slot_date, start_time, index, duration)
+        schedule[tribunal_id] = (slot_date, start.time(), end.time(), room)
+    return schedule
+
+
+def get_schedule(semester_id, refresh=False):
+    """Return the cached schedule of a semester, building it on a miss."""
+    key = _cache_key(semester_id)
+    schedule = None if refresh else cache.get(key)
+    if schedule is None:
+        schedule = build_schedule(semester_id)
+        cache.set(key, schedule, CACHE_TIMEOUT)
+    return schedule
+
+
+def get_entry(schedules, semester_id, tribunal_id):
+    """
+    Look a tribunal up in a dict of already loaded schedules, loading the
+    semester on first use and rebuilding it once if the tribunal is missing.
+    """
+    schedule = schedules.get(semester_id)
+    if schedule is None:
+        schedule = schedules[semester_id] = get_schedule(semester_id)
+    entry = schedule.get(tribunal_id)
+    if entry is None:
+        schedule = schedules[semester_id] = get_schedule(semester_id, refresh=True)
+        entry = schedule.get(tribunal_id)
+    return entry
+
+
+def invalidate(*semester_ids):
+    cache.delete_many([_cache_key(semester_id) for semester_id in semester_ids if semester_id is not None])
@@ -0,0 +1,204 @@
+"""
+Automatic defense scheduling.
+
+plan_defenses() places every approved, unscheduled TFM of a semester into the
+semester's slots. Nobody involved in a defense (the author and the directors)
+may be in two overlapping defenses, counting the tribunals they already sit
+on. Slots fill in index order so their end times stay contiguous.
+
+Placement is greedy first-fit, most constrained TFMs first. A swap pass then
+tries to place whatever is left: an unplaced TFM takes an assigned TFM's
+position, and the assigned TFM moves to a free one. Everything is worked out
+in memory from a handful of queries, so thousands of TFMs plan in seconds.
+"""
+from collections import defaultdict
+
+from committees.models import Committee
+from semesters.index import get_semester_index
+from slots.models import Slot
+from tfms.models import TFM
+from .bulk import bulk_create_tribunals
+from .models import Tribunal
+from .schedule import entry_window, get_schedule, tribunal_window
+
+NO_CAPACITY = "No slot capacity left in the semester."
+CONFLICT = "Every free slot overlaps a defense of its author or directors."
+
+
+class _OpenSlot:
+    """A slot with its free indexes, handing them out lowest first."""
+
+    def __init__(self, slot, free_indexes, duration):
+        self.slot = slot
+        self.free_indexes = free_indexes
+        self.duration = duration
+
+    def next_window(self):
+        return tribunal_window(self.slot.date, self.slot.start_time, self.free_indexes[0], self.duration)
+
+
+class _Calendar:
+    """Busy windows per person and day, for the few people of one defense at a time."""
+
+    def __init__(self):
+        self.busy = defaultdict(list)
+
+    def is_free(self, people, start, end, ignore=None):
+        for person in people:
+            for busy_start, busy_end, owner in self.busy[person, start.date()]:
+                if (owner is None or owner != ignore) and busy_start < end and start < busy_end:
+                    return False
+        return True
+
+    def book(self, people, start, end, owner=None):
+        for person in people:
+            self.busy[person, start.date()].append((start, end, owner))
+
+    def release(self, people, start, owner):
+        for person in people:
+            windows = self.busy[person, start.date()]
+            windows[:] = [window for window in windows if window[2] != owner]
+
+
+def unscheduled_tfms(semester):
+    """Approved TFMs without a tribunal whose semester (by creation date) is `semester`."""
+    semesters = get_semester_index()
+    candidates = TFM.objects.filter(
+        status='approved', tribunal__isnull=True,
+        created_at__date__range=(semester.start_date, semester.end_date),
+    ).order_by('id')
+    return [tfm for tfm in candidates if semesters.containing(tfm.created_at.date()) == semester]
+
+
+def plan_defenses(semester):
+    """
+    Return (assignments, unassigned) for the semester without writing anything.
+
+    Assignments are dicts with tfm, title, slot, room, index, start and end;
+    unassigned entries carry the tfm, its title and a reason.
+    """
+    tfms = unscheduled_tfms(semester)
+    tfm_ids = {tfm.pk for tfm in tfms}
+    people = {tfm.pk: {tfm.author_id} for tfm in tfms}
+    for tfm_id, user_id in TFM.directors.through.objects.filter(
+        tfm__status='approved', tfm__tribunal__isnull=True,
+    ).values_list('tfm_id', 'user_id'):
+        if tfm_id in tfm_ids:
+            people[tfm_id].add(user_id)
+    involved = set().union(*people.values()) if people else set()
+
+    calendar = _Calendar()
+    commitments = defaultdict(int)
+    for user_id, window in _commitments(semester):
+        if user_id in involved:
+            calendar.book([user_id], *window)
+            commitments[user_id] += 1
+
+    open_slots = _open_slots(semester)
+
+    def first_fit(tfm_id, ignore=None):
+        for open_slot in open_slots:
+            if calendar.is_free(people[tfm_id], *open_slot.next_window(), ignore):
+                return open_slot
+        return None
+
+    placed = {}
+
+    def place(tfm_id, open_slot):
+        start, end = open_slot.next_window()
+        placed[tfm_id] = (open_slot.slot, open_slot.free_indexes.pop(0), start, end)
+        calendar.book(people[tfm_id], start, end, tfm_id)
+        if not open_slot.free_indexes:
+            open_slots.remove(open_slot)
+
+    # Most constrained first: people with the most existing defenses, then
+    # TFMs with the most directors.
+    load = {tfm_id: sum(commitments[person] for person in members) for tfm_id, members in people.items()}
+    order = sorted(tfm_ids, key=lambda tfm_id: (-load[tfm_id], -len(people[tfm_id]), tfm_id))
+
+    leftover = []
+    for tfm_id in order:
+        open_slot = first_fit(tfm_id)
+        if open_slot is None:
+            leftover.append(tfm_id)
+        else:
+            place(tfm_id, open_slot)
+
+    unassigned = []
+    for tfm_id in leftover:
+        if not open_slots:
+            unassigned.append((tfm_id, NO_CAPACITY))
+        elif not _swap_in(tfm_id, placed, people, calendar, first_fit, place):
+            unassigned.append((tfm_id, CONFLICT))
+
+    titles = {tfm.pk: tfm.title for tfm in tfms}
+    assignments = [
+        {
+            'tfm': tfm_id, 'title': titles[tfm_id], 'slot': slot.pk, 'room': slot.room,
+            'index': index, 'start': start, 'end': end,
+        }
+        for tfm_id, (slot, index, start, end) in sorted(placed.items(), key=lambda item: item[1][2:] + (item[0],))
+    ]
+    unassigned = [{'tfm': tfm_id, 'title': titles[tfm_id], 'reason': reason} for tfm_id, reason in unassigned]
+    return assignments, unassigned
+
+
+def apply_plan(assignments):
+    """Create the planned tribunals in one transaction; see bulk_create_tribunals."""
+    return bulk_create_tribunals([
+        {'tfm': assignment['tfm'], 'slot': assignment['slot'], 'index': assignment['index']}
+        for assignment in assignments
+    ])
+
+
+def _swap_in(tfm_id, placed, people, calendar, first_fit, place):
+    """
+    Give an unplaced TFM the position of a placed one that can move to a free
+    position. Returns whether it succeeded.
+    """
+    for other_id, (slot, index, start, end) in list(placed.items()):
+        if not calendar.is_free(people[tfm_id], start, end, ignore=other_id):
+            continue
+        calendar.release(people[other_id], start, other_id)
+        calendar.book(people[tfm_id], start, end, tfm_id)
+        target = first_fit(other_id)
+        if target is None:
+            calendar.release(people[tfm_id], start, tfm_id)
+            calendar.book(people[other_id], start, end, other_id)
+            continue
+        del placed[other_id]
+        placed[tfm_id] = (slot, index, start, end)
+        place(other_id, target)
+        return True
+    return False
+
+
+def _commitments(semester):
+    """(user_id, (start, end)) for every defense of the semester a user takes part in."""
+    schedule = get_schedule(semester.pk)
+    rows = [
+        *Committee.objects.filter(tribunal__slot__track__semester=semester).values_list('user_id', 'tribunal_id'),
+        *Tribunal.objects.filter(slot__track__semester=semester).values_list('tfm__author_id', 'id'),
+        *TFM.directors.through.objects.filter(
+            tfm__tribunal__slot__track__semester=semester
+        ).values_list('user_id', 'tfm__tribunal__id'),
+    ]
+    for user_id, tribunal_id in rows:
+        entry = schedule.get(tribunal_id)
+        if entry is not None:
+            yield user_id, entry_window(entry)
+
+
+def _open_slots(semester):
+    slots = list(Slot.objects.filter(track__semester=semester).order_by('date', 'start_time', 'id'))
+    taken = defaultdict(set)
+    for slot_id, index in Tribunal.objects.filter(slot__in=slots).values_list('slot_id', 'index'):
+        taken[slot_id].add(index)
+    open_slots = []
+    for slot in slots:
+        # Only fill after the last used index so the slot's end time stays contiguous
+        last_index = max(taken[slot.pk], default=0)
+        free_indexes = list(range(last_index + 1, slot.max_tfms + 1))
+        if free_indexes:
+            open_slots.append(_OpenSlot(slot, free_indexes, semester.pre_duration))
+    return open_slots
@@ -1,6 +1,9 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import Tribunal
+from . import schedule
 from tfms.serializers import TFMReadSerializer
+from slots.models import Slot
 from slots.serializers import SlotSerializer
 from committees.serializers import CommitteeSerializer
 from datetime import datetime, date
@@ -19,22 +22,41 @@ class TribunalReadSerializer(serializers.ModelSerializer):
         fields = ['id', 'tfm', 'slot', 'committees', 'is_ready', 'is_full', 'start_time', 'end_time', 'index']
 
     def get_committees(self, obj):
-        committee_entries = obj.committees.select_related("user")
+        if 'committees' in getattr(obj, '_prefetched_objects_cache', {}):
+            committee_entries = obj.committees.all()
+        else:
+            committee_entries = obj.committees.select_related("user")
         return CommitteeSerializer(committee_entries, many=True).data
 
     def get_is_ready(self, obj):
+        # Annotated by Tribunal.objects.with_read_annotations()
+        if hasattr(obj, 'president_count'):
+            return bool(obj.president_count and obj.secretary_count and obj.vocal_count)
         return obj.is_ready()
 
     def get_is_full(self, obj):
+        if hasattr(obj, 'committee_count'):
+            return obj.committee_count >= obj.get_semester().max_committees
         return obj.is_full()
 
+    def _schedule_entry(self, obj):
+        # Semester schedules are loaded once per serializer, not once per row
+        schedules = self.__dict__.setdefault('_schedules', {})
+        return schedule.get_entry(schedules, obj.slot.track.semester_id, obj.pk)
+
     def get_start_time(self, obj):
+        entry = self._schedule_entry(obj)
+        if entry is not None:
+            return entry[1].strftime("%H:%M")
         base_time = datetime.combine(date.today(), obj.slot.start_time)
         duration = obj.slot.track.semester.pre_duration
         tribunal_start = base_time + ((obj.index - 1) * duration)
         return tribunal_start.strftime("%H:%M")
 
     def get_end_time(self, obj):
+        entry = self._schedule_entry(obj)
+        if entry is not None:
+            return entry[2].strftime("%H:%M")
         base_time = datetime.combine(date.today(), obj.slot.start_time)
         duration = obj.slot.track.semester.pre_duration
         tribunal_end = base_time + (obj.index * duration)
@@ -66,35 +88,55 @@ class TribunalSerializer(serializers.ModelSerializer):
         return slot
 
     def create(self, validated_data):
-        if 'index' not in validated_data:
-            slot = validated_data['slot']
-            taken_indexes = set(slot.tribunals.values_list('index', flat=True))
-            for i in range(1, slot.max_tfms + 1):
-                if i not in taken_indexes:
-                    validated_data['index'] = i
-                    break
-            else:
-                raise serializers.ValidationError("No available index in this slot.")
-
-        tribunal = super().create(validated_data)
-        self._recalculate_slot_end_time(tribunal.slot)
+        # validate() ran without locks; repeat the fullness and index checks with
+        # the slot row locked so two concurrent requests cannot both pass them.
+        try:
+            with transaction.atomic():
+                slot = self._lock_slots(validated_data['slot'])[validated_data['slot'].pk]
+                validated_data['slot'] = slot
+                if slot.is_full():
+                    raise serializers.ValidationError("This slot has reached its maximum number of TFMs.")
+
+                if 'index' not in validated_data:
+                    validated_data['index'] = Tribunal.next_free_index(slot)
+                    if validated_data['index'] is None:
+                        raise serializers.ValidationError("No available index in this slot.")
+                else:
+                    self._validate_index(validated_data['index'], slot)
+
+                tribunal = super().create(validated_data)
+                self._recalculate_slot_end_time(tribunal.slot)
+        except IntegrityError:
+            # Backends without row locks (SQLite) can still race on unique_together.
+            raise serializers.ValidationError("This slot changed while the tribunal was being created, try again.")
         return tribunal
 
     def update(self, instance, validated_data):
-        if 'index' in validated_data:
-            self._validate_index(validated_data['index'], validated_data.get('slot', instance.slot), instance)
+        with transaction.atomic():
+            slots = self._lock_slots(instance.slot, validated_data.get('slot', instance.slot))
+            original_slot = slots[instance.slot_id]
+            new_slot = slots[validated_data.get('slot', original_slot).pk]
 
-        original_slot = instance.slot
-        new_slot = validated_data.get('slot', original_slot)
+            if new_slot != original_slot:
+                if new_slot.is_full():
+                    raise serializers.ValidationError("This slot has reached its maximum number of TFMs.")
+                validated_data['slot'] = new_slot
+            if 'index' in validated_data or new_slot != original_slot:
+                self._validate_index(validated_data.get('index', instance.index), new_slot, instance)
 
-        instance = super().update(instance, validated_data)
+            instance = super().update(instance, validated_data)
 
-        if original_slot != new_slot:
-            self._recalculate_slot_end_time(original_slot)
-        self._recalculate_slot_end_time(new_slot)
+            if original_slot != new_slot:
+                self._recalculate_slot_end_time(original_slot)
+            self._recalculate_slot_end_time(new_slot)
 
         return instance
 
+    def _lock_slots(self, *slots):
+        """Lock the given slots until the transaction ends, in pk order to avoid deadlocks."""
+        pks = sorted({slot.pk for slot in slots})
+        return {slot.pk: slot for slot in Slot.objects.select_for_update().filter(pk__in=pks).order_by('pk')}
+
     def _validate_index(self, index, slot, instance=None):
         if index < 1 or index > slot.max_tfms:
             raise serializers.ValidationError(f"Index must be between 1 and {slot.max_tfms}.")
@@ -112,3 +154,10 @@ class TribunalSerializer(serializers.ModelSerializer):
                 datetime.combine(date.today(), slot.start_time) + total_duration
             ).time()
         slot.save(update_fields=["end_time"])
+
+
+class TribunalBulkItemSerializer(serializers.Serializer):
+    """One (tfm, slot[, index]) entry of POST /tribunals/bulk/. Ids only; tribunals.bulk checks them."""
+    tfm = serializers.IntegerField()
+    slot = serializers.IntegerField()
+    index = serializers.IntegerField(required=False)
@@ -1,7 +1,16 @@
-from django.db import models
-from django.db.models.signals import post_save, post_delete
+from functools import partial
+from django.db import models, transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from .models import Tribunal
+from . import schedule
+from backend import response_cache
+from committees.models import Committee
+from slots.models import Slot
+from tfms.models import TFM, TFMReview
+from tracks.models import Track
+from semesters.models import Semester
+from users.models import User
 from datetime import datetime, date
 
 def recalculate_slot_end_time(slot):
@@ -28,3 +37,107 @@ def update_slot_end_time_on_create_or_update(sender, instance, **kwargs):
 @receiver(post_delete, sender=Tribunal)
 def update_slot_end_time_on_delete(sender, instance, **kwargs):
     recalculate_slot_end_time(instance.slot)
+
+
+# ──────── Schedule cache invalidation ────────
+# Only fields that feed the schedule (slot, date, time, room, pre_duration)
+# matter; end_time rewrites from recalculate_slot_end_time are ignored.
+# The cache is cleared once the write commits: cleared before, a concurrent
+# reader could cache the old schedule again until the timeout.
+
+def _semester_of_slot(slot_id):
+    return Slot.objects.filter(pk=slot_id).values_list('track__semester_id', flat=True).first()
+
+def _semester_of_track(track_id):
+    return Track.objects.filter(pk=track_id).values_list('semester_id', flat=True).first()
+
+def _only_end_time(update_fields):
+    return update_fields is not None and set(update_fields) == {'end_time'}
+
+@receiver(pre_save, sender=Tribunal)
+def remember_tribunal_semester(sender, instance, **kwargs):
+    if instance.pk:
+        instance._previous_semester_id = Tribunal.objects.filter(pk=instance.pk).values_list(
+            'slot__track__semester_id', flat=True
+        ).first()
+
+@receiver(post_save, sender=Tribunal)
+@receiver(post_delete, sender=Tribunal)
+def invalidate_schedule_on_tribunal_change(sender, instance, **kwargs):
+    semester_ids = getattr(instance, '_previous_semester_id', None), _semester_of_slot(instance.slot_id)
+    transaction.on_commit(partial(schedule.invalidate, *semester_ids))
+    response_cache.invalidate(response_cache.SCHEDULE, *semester_ids)
+
+@receiver(pre_save, sender=Slot)
+def remember_slot_semester(sender, instance, update_fields=None, **kwargs):
+    if instance.pk and not _only_end_time(update_fields):
+        instance._previous_semester_id = _semester_of_slot(instance.pk)
+
+@receiver(post_save, sender=Slot)
+@receiver(post_delete, sender=Slot)
+def invalidate_schedule_on_slot_change(sender, instance, update_fields=None, **kwargs):
+    if _only_end_time(update_fields):
+        return
+    semester_ids = getattr(instance, '_previous_semester_id', None), _semester_of_track(instance.track_id)
+    transaction.on_commit(partial(schedule.invalidate, *semester_ids))
+    response_cache.invalidate(response_cache.SCHEDULE, *semester_ids)
+
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def invalidate_schedule_on_semester_change(sender, instance, **kwargs):
+    transaction.on_commit(partial(schedule.invalidate, instance.pk))
+    response_cache.invalidate(response_cache.SCHEDULE, instance.pk)
+
+
+# ──────── Response cache invalidation ────────
+# Everything else the public track, slot and tribunal responses show. Writes
+# that can be traced to one semester only drop that semester's responses.
+
+def _semester_of_tribunal(tribunal_id):
+    return Tribunal.objects.filter(pk=tribunal_id).values_list('slot__track__semester_id', flat=True).first()
+
+def _semester_of_tfm(tfm_id):
+    return Tribunal.objects.filter(tfm_id=tfm_id).values_list('slot__track__semester_id', flat=True).first()
+
+@receiver(post_save, sender=Track)
+@receiver(post_delete, sender=Track)
+def invalidate_responses_on_track_change(sender, instance, **kwargs):
+    # A track can move between semesters, so drop them all
+    response_cache.invalidate(response_cache.SCHEDULE)
+
+@receiver(post_save, sender=Committee)
+@receiver(post_delete, sender=Committee)
+def invalidate_responses_on_committee_change(sender, instance, **kwargs):
+    response_cache.invalidate(response_cache.SCHEDULE, _semester_of_tribunal(instance.tribunal_id))
+
+@receiver(post_save, sender=TFM)
+@receiver(post_delete, sender=TFM)
+def invalidate_responses_on_tfm_change(sender, instance, **kwargs):
+    # TFMs without a tribunal appear in no schedule response
+    semester_id = _semester_of_tfm(instance.pk)
+    if semester_id is not None:
+        response_cache.invalidate(response_cache.SCHEDULE, semester_id)
+
+@receiver(m2m_changed, sender=TFM.directors.through)
+def invalidate_responses_on_directors_change(sender, instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # Changed from the user's side, possibly across semesters
+        response_cache.invalidate(response_cache.SCHEDULE)
+    else:
+        invalidate_responses_on_tfm_change(sender, instance)
+
+@receiver(post_save, sender=TFMReview)
+@receiver(post_delete, sender=TFMReview)
+def invalidate_responses_on_review_change(sender, instance, **kwargs):
+    semester_id = _semester_of_tfm(instance.tfm_id)
+    if semester_id is not None:
+        response_cache.invalidate(response_cache.SCHEDULE, semester_id)
+
+@receiver(post_save, sender=User)
+def invalidate_responses_on_user_change(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no response shows
+    if update_fields is not None and set(update_fields) <= {'last_login', 'password'}:
+        return
+    response_cache.invalidate(response_cache.SCHEDULE)
@@ -0,0 +1,152 @@
+"""
+Committee auto-staffing.
+
+plan_committees() fills the missing president, secretary and vocal seats of
+every tribunal in a semester, up to the semester's min_committees members,
+never past max_committees. A teacher is never seated in two overlapping
+defenses, counting the ones they already sit on or direct, nor on the
+tribunal of a TFM they direct. Each seat goes to the eligible teacher with
+the fewest committees so far, so the load spreads evenly.
+
+Overlaps are precomputed as a conflict matrix: one bitset per tribunal with a
+bit set for every tribunal whose defense overlaps it. A teacher's schedule is
+the bitset of tribunals they are busy in, so "is this teacher free?" is one
+AND over Python ints however many tribunals the semester has.
+
+A plan is computed from an unlocked snapshot. apply_plan() locks the planned
+tribunals and teachers, which auto_assign locks as well, and plans again
+before inserting, so members seated meanwhile cannot end up duplicated,
+double-booked or past max_committees.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from backend import response_cache
+from committees.models import Committee
+from tfms.models import TFM
+from users.models import User
+from .models import Tribunal
+from .schedule import entry_window, get_schedule
+
+ROLES = [role for role, _ in Committee.ROLE_CHOICES]
+NO_TEACHER = "No teacher is free at that time."
+CHANGED = "Committees changed while staffing, try again."
+
+
+def conflict_matrix(windows):
+    """
+    For a list of (start, end) windows return one int per window whose bit j
+    is set when window j overlaps it (itself included).
+    """
+    order = sorted(range(len(windows)), key=lambda i: windows[i])
+    masks = [1 << i for i in range(len(windows))]
+    # Sweep by start time; each window is compared only with the ones that
+    # start before it ends.
+    for position, i in enumerate(order):
+        end = windows[i][1]
+        for j in order[position + 1:]:
+            if windows[j][0] >= end:
+                break
+            masks[i] |= 1 << j
+            masks[j] |= 1 << i
+    return masks
+
+
+def plan_committees(semester):
+    """
+    Return (assignments, unstaffed) for the semester without writing anything.
+
+    Assignments are dicts with tribunal, user and role; unstaffed entries name
+    the tribunal, the role left empty and a reason.
+    """
+    # Rebuilt rather than read from the cache so the plan covers every tribunal; rows for
+    # tribunals created since (and not in the snapshot) are skipped below
+    schedule = get_schedule(semester.pk, refresh=True)
+    tribunal_ids = sorted(schedule, key=lambda tribunal_id: (schedule[tribunal_id], tribunal_id))
+    position = {tribunal_id: i for i, tribunal_id in enumerate(tribunal_ids)}
+    conflicts = conflict_matrix([entry_window(schedule[tribunal_id]) for tribunal_id in tribunal_ids])
+
+    teachers = list(User.objects.filter(role='teacher').order_by('id').values_list('id', flat=True))
+    busy = defaultdict(int)
+    load = dict.fromkeys(teachers, 0)
+    members = defaultdict(set)
+    roles = defaultdict(list)
+    for tribunal_id, user_id, role in Committee.objects.filter(
+        tribunal__slot__track__semester=semester
+    ).values_list('tribunal_id', 'user_id', 'role'):
+        if tribunal_id not in position:
+            continue
+        busy[user_id] |= 1 << position[tribunal_id]
+        members[tribunal_id].add(user_id)
+        roles[tribunal_id].append(role)
+        if user_id in load:
+            load[user_id] += 1
+
+    directors = defaultdict(set)
+    for user_id, tribunal_id in TFM.directors.through.objects.filter(
+        tfm__tribunal__slot__track__semester=semester
+    ).values_list('user_id', 'tfm__tribunal__id'):
+        if tribunal_id not in position:
+            continue
+        busy[user_id] |= 1 << position[tribunal_id]
+        directors[tribunal_id].add(user_id)
+
+    assignments, unstaffed = [], []
+    for tribunal_id in tribunal_ids:
+        bit, overlapping = 1 << position[tribunal_id], conflicts[position[tribunal_id]]
+        for role in _missing_roles(roles[tribunal_id], semester):
+            excluded = members[tribunal_id] | directors[tribunal_id]
+            candidates = [
+                user_id for user_id in teachers
+                if user_id not in excluded and not busy[user_id] & overlapping
+            ]
+            if not candidates:
+                unstaffed.append({'tribunal': tribunal_id, 'role': role, 'reason': NO_TEACHER})
+                continue
+            user_id = min(candidates, key=lambda user_id: (load[user_id], user_id))
+            busy[user_id] |= bit
+            load[user_id] += 1
+            members[tribunal_id].add(user_id)
+            assignments.append({'tribunal': tribunal_id, 'user': user_id, 'role': role})
+    return assignments, unstaffed
+
+
+def lock(tribunal_ids, user_ids):
+    """Lock tribunals, then users, each in pk order; call inside a transaction."""
+    list(Tribunal.objects.select_for_update().filter(pk__in=tribunal_ids).order_by('pk').values_list('pk'))
+    list(User.objects.select_for_update().filter(pk__in=user_ids).order_by('pk').values_list('pk'))
+
+
+def apply_plan(semester, assignments):
+    """
+    Create the planned committee members in one transaction. Raises a
+    ValidationError if the semester's committees changed since the plan.
+    """
+    try:
+        with transaction.atomic():
+            lock({item['tribunal'] for item in assignments}, {item['user'] for item in assignments})
+            if plan_committees(semester)[0] != assignments:
+                raise serializers.ValidationError({"detail": CHANGED})
+            members = Committee.objects.bulk_create([
+                Committee(tribunal_id=item['tribunal'], user_id=item['user'], role=item['role'])
+                for item in assignments
+            ])
+    except IntegrityError:
+        # Seated by a writer that does not take the locks
+        raise serializers.ValidationError({"detail": CHANGED})
+    # bulk_create sends no post_save
+    if members:
+        response_cache.invalidate(response_cache.SCHEDULE, *Tribunal.objects.filter(
+            pk__in={item['tribunal'] for item in assignments}
+        ).values_list('slot__track__semester_id', flat=True).distinct())
+    return members
+
+
+def _missing_roles(roles, semester):
+    """Roles to add so the tribunal is ready and has min_committees members, within max_committees."""
+    target = min(max(semester.min_committees, len(ROLES)), semester.max_committees)
+    missing = [role for role in ROLES if role not in roles]
+    missing += ['vocal'] * (target - len(roles) - len(missing))
+    return missing[:max(semester.max_committees - len(roles), 0)]
@@ -1,4 +1,11 @@
 from rest_framework.test import APITestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+import threading
+from collections import defaultdict
+import unittest
+from unittest import mock
 from rest_framework import serializers
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -14,6 +21,11 @@ from tracks.models import Track
 from semesters.models import Semester
 from tribunals.serializers import TribunalSerializer, TribunalReadSerializer
 from tribunals.views import TribunalViewSet
+from tribunals.availability import IntervalIndex, available_tribunals
+from tribunals import schedule, scheduler, staffing
+from django.core.management import call_command
+from django.utils import timezone
+from io import StringIO
 
 class TribunalTests(APITestCase):
     
@@ -23,6 +35,8 @@ class TribunalTests(APITestCase):
                 tfm.file.delete(save=False)
         
     def setUp(self):
+        # Cached schedules are keyed by semester id, which tests reuse
+        cache.clear()
         self.admin = User.objects.create_user(
             email='admin@example.com', full_name='Admin', password='adminpass',
             role='teacher', is_staff=True
@@ -204,6 +218,18 @@ class TribunalTests(APITestCase):
         expected = (datetime.combine(date.today(), self.slot.start_time) + self.slot.track.semester.pre_duration).time()
         self.assertEqual(self.slot.end_time, expected)
 
+    def test_serializer_create_rechecks_fullness_under_lock(self):
+        # Another request fills the slot between validation and save.
+        self.slot.max_tfms = 1
+        self.slot.save()
+        serializer = TribunalSerializer(data={"tfm": self.tfm.id, "slot": self.slot.id})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        tfm2 = TFM.objects.create(title="Other", file=SimpleUploadedFile("o.pdf", b"x"), author=self.student)
+        Tribunal.objects.create(tfm=tfm2, slot=self.slot)
+        with self.assertRaises(serializers.ValidationError):
+            serializer.save()
+        self.assertEqual(self.slot.tribunals.count(), 1)
+
     def test_read_serializer_times(self):
         tribunal = Tribunal.objects.create(tfm=self.tfm, slot=self.slot, index=1)
         serializer = TribunalReadSerializer(instance=tribunal)
@@ -256,9 +282,17 @@ class TribunalTests(APITestCase):
         resp2 = self.client.get("/tribunals/ready/")
         self.assertEqual(resp1.status_code, 200)
         self.assertEqual(resp2.status_code, 200)
-        self.assertEqual(len(resp1.data), 1)
-        self.assertEqual(len(resp2.data), 0)
+        self.assertEqual(len(resp1.data["results"]), 1)
+        self.assertEqual(len(resp2.data["results"]), 0)
     
+    def test_available_tribunals_without_current_semester(self):
+        Semester.objects.update(start_date=date(2020, 1, 1), end_date=date(2020, 6, 30))
+        self.client.force_authenticate(user=self.admin)
+        resp = self.client.get("/tribunals/available/")
+        self.assertEqual(resp.status_code, 200)
+        # The same page envelope as when there are tribunals
+        self.assertEqual((resp.data["results"], resp.data["next"]), ([], None))
+
     def test_my_assignments_returns_correct_tribunals(self):
         # Create a tribunal and assign the current user as a committee member
         tribunal = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
@@ -268,8 +302,8 @@ class TribunalTests(APITestCase):
         response = self.client.get("/tribunals/my_assignments/")
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], tribunal.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], tribunal.id)
 
     def test_available_and_ready_tribunals(self):
         self.client.force_authenticate(user=self.admin)
@@ -283,7 +317,7 @@ class TribunalTests(APITestCase):
 
         self.assertEqual(resp_available.status_code, 200)
         self.assertEqual(resp_ready.status_code, 200)
-        self.assertEqual(len(resp_ready.data), 1)
+        self.assertEqual(len(resp_ready.data["results"]), 1)
     
     def test_my_assignments_filtered_by_semester(self):
         tribunal_main = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
@@ -296,8 +330,8 @@ class TribunalTests(APITestCase):
         resp = self.client.get(f"/tribunals/my_assignments/?semester={self.semester.id}")
 
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(len(resp.data), 1)
-        self.assertEqual(resp.data[0]["id"], tribunal_main.id)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertEqual(resp.data["results"][0]["id"], tribunal_main.id)
 
     def test_ready_tribunals_filtered_by_semester(self):
         tribunal_main = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
@@ -314,8 +348,8 @@ class TribunalTests(APITestCase):
         resp = self.client.get(f"/tribunals/ready/?semester={self.semester.id}")
 
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(len(resp.data), 1)
-        self.assertEqual(resp.data[0]["id"], tribunal_main.id)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertEqual(resp.data["results"][0]["id"], tribunal_main.id)
     
     def test_available_tribunals_current_semester_only(self):
         # Set today's date inside self.semester and outside other_semester
@@ -331,8 +365,8 @@ class TribunalTests(APITestCase):
         resp = self.client.get("/tribunals/available/")
 
         self.assertEqual(resp.status_code, 200)
-        self.assertEqual(len(resp.data), 1)
-        self.assertEqual(resp.data[0]["tfm"]["title"], self.tfm.title)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertEqual(resp.data["results"][0]["tfm"]["title"], self.tfm.title)
     
     def test_my_assignments_includes_author(self):
         # Create a tribunal where the student is the author
@@ -344,8 +378,8 @@ class TribunalTests(APITestCase):
         response = self.client.get("/tribunals/my_assignments/")
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], tribunal.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], tribunal.id)
 
     def test_my_assignments_requires_authentication(self):
         # Create a tribunal where the student is the TFM author
@@ -388,7 +422,7 @@ class TribunalTests(APITestCase):
         resp = self.client.get("/tribunals/available/")
         self.assertEqual(resp.status_code, 200)
         # tribunal2 should be available since it's on a different day
-        available_ids = [t['id'] for t in resp.data]
+        available_ids = [t['id'] for t in resp.data["results"]]
         self.assertIn(tribunal2.id, available_ids)
         self.assertNotIn(tribunal1.id, available_ids)
 
@@ -422,7 +456,7 @@ class TribunalTests(APITestCase):
         resp = self.client.get("/tribunals/available/")
         self.assertEqual(resp.status_code, 200)
         # tribunal2 should NOT be available since it's a conflict (same day and time)
-        available_ids = [t['id'] for t in resp.data]
+        available_ids = [t['id'] for t in resp.data["results"]]
         self.assertNotIn(tribunal2.id, available_ids)
         self.assertNotIn(tribunal1.id, available_ids)
 
@@ -452,7 +486,7 @@ class TribunalTests(APITestCase):
         self.client.force_authenticate(user=self.admin)
         resp = self.client.get("/tribunals/available/")
         self.assertEqual(resp.status_code, 200)
-        available_ids = [t['id'] for t in resp.data]
+        available_ids = [t['id'] for t in resp.data["results"]]
         self.assertNotIn(tribunal.id, available_ids)
 
     def test_patch_evaluation_allowed_for_member(self):
@@ -469,3 +503,416 @@ class TribunalTests(APITestCase):
         self.assertEqual(resp.status_code, 403)
         self.assertIn('not a member', resp.data['detail'].lower())
 
+    # ──────── Availability Engine Tests ────────
+
+    def test_interval_index_overlaps(self):
+        day = date(2025, 6, 17)
+        busy = IntervalIndex([
+            (datetime.combine(day, time(9, 0)), datetime.combine(day, time(9, 45))),
+            (datetime.combine(day, time(12, 0)), datetime.combine(day, time(12, 45))),
+        ])
+        self.assertTrue(busy.overlaps(datetime.combine(day, time(9, 30)), datetime.combine(day, time(10, 15))))
+        self.assertTrue(busy.overlaps(datetime.combine(day, time(11, 30)), datetime.combine(day, time(13, 0))))
+        # Back-to-back windows do not overlap
+        self.assertFalse(busy.overlaps(datetime.combine(day, time(9, 45)), datetime.combine(day, time(10, 30))))
+        # Same time on another day does not overlap
+        other_day = day + timedelta(days=1)
+        self.assertFalse(busy.overlaps(datetime.combine(other_day, time(9, 0)), datetime.combine(other_day, time(9, 45))))
+
+    def test_available_tribunals_query_count_is_constant(self):
+        for i in range(5):
+            slot = Slot.objects.create(
+                track=self.track, start_time=time(8 + i, 0), end_time=time(8 + i, 45),
+                room=f"R{i}", date=date(2025, 6, 18), max_tfms=1
+            )
+            tfm = TFM.objects.create(title=f"TFM {i}", file=SimpleUploadedFile(f"t{i}.pdf", b"data"), author=self.student)
+            tribunal = Tribunal.objects.create(tfm=tfm, slot=slot)
+            Committee.objects.create(tribunal=tribunal, user=self.secretary, role='secretary')
+            if i == 0:
+                Committee.objects.create(tribunal=tribunal, user=self.president, role='president')
+
+        available_tribunals(self.president, self.semester)  # warm the schedule cache
+        with self.assertNumQueries(2):
+            available = available_tribunals(self.president, self.semester)
+        # The president's own tribunal (08:00) is excluded; all others are free
+        self.assertEqual(len(available), 4)
+
+    # ──────── Read Annotation Tests ────────
+
+    def test_read_annotations_match_model_methods(self):
+        tribunal = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+        Committee.objects.create(tribunal=tribunal, user=self.president, role='president')
+        Committee.objects.create(tribunal=tribunal, user=self.secretary, role='secretary')
+
+        annotated = Tribunal.objects.with_read_annotations().get(pk=tribunal.pk)
+        data = TribunalReadSerializer(annotated).data
+        self.assertEqual(annotated.committee_count, 2)
+        self.assertFalse(data['is_ready'])
+        self.assertEqual(data['is_ready'], tribunal.is_ready())
+        self.assertEqual(data['is_full'], tribunal.is_full())
+        self.assertEqual(len(data['committees']), 2)
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)  # count the queries of a real render, not a cache hit
+    def test_list_tribunals_query_count_is_constant(self):
+        teachers = [self.president, self.secretary, self.vocal1]
+        for i in range(6):
+            slot = Slot.objects.create(
+                track=self.track, start_time=time(8 + i, 0), end_time=time(8 + i, 45),
+                room=f"R{i}", date=date(2025, 6, 18), max_tfms=1
+            )
+            tfm = TFM.objects.create(title=f"TFM {i}", file=SimpleUploadedFile(f"t{i}.pdf", b"data"), author=self.student)
+            tfm.directors.set([self.director])
+            tribunal = Tribunal.objects.create(tfm=tfm, slot=slot)
+            for user, role in zip(teachers, ['president', 'secretary', 'vocal']):
+                Committee.objects.create(tribunal=tribunal, user=user, role=role)
+
+        self.client.get("/tribunals/")  # warm the schedule cache
+        # Tribunals (with TFM, author, review, slot, track, semester), directors, committees
+        with self.assertNumQueries(3):
+            resp = self.client.get("/tribunals/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data["results"]), 6)
+        self.assertTrue(all(t['is_ready'] for t in resp.data["results"]))
+
+    def test_ready_queryset_requires_every_role(self):
+        tribunal = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+        Committee.objects.create(tribunal=tribunal, user=self.president, role='president')
+        Committee.objects.create(tribunal=tribunal, user=self.vocal1, role='vocal')
+        Committee.objects.create(tribunal=tribunal, user=self.vocal2, role='vocal')
+        self.assertFalse(Tribunal.objects.ready().exists())
+
+        Committee.objects.create(tribunal=tribunal, user=self.secretary, role='secretary')
+        self.assertEqual(list(Tribunal.objects.ready()), [tribunal])
+
+    # ──────── Bulk Creation Tests ────────
+
+    def make_tfms(self, count):
+        return [
+            TFM.objects.create(title=f"Bulk {i}", file=SimpleUploadedFile(f"b{i}.pdf", b"x"), author=self.student)
+            for i in range(count)
+        ]
+
+    def test_bulk_create_assigns_indexes_and_end_times(self):
+        self.client.force_authenticate(user=self.admin)
+        other_slot = Slot.objects.create(track=self.track, start_time=time(11, 0), end_time=time(11, 0),
+                                         date=date(2025, 6, 18), room="B202", max_tfms=3)
+        Tribunal.objects.create(tfm=self.tfm, slot=self.slot, index=1)
+        tfms = self.make_tfms(3)
+
+        response = self.client.post("/tribunals/bulk/", [
+            {"tfm": tfms[0].id, "slot": self.slot.id},
+            {"tfm": tfms[1].id, "slot": other_slot.id, "index": 2},
+            {"tfm": tfms[2].id, "slot": other_slot.id},
+        ], format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual([t["index"] for t in response.data], [2, 2, 1])
+        self.slot.refresh_from_db()
+        other_slot.refresh_from_db()
+        self.assertEqual(self.slot.end_time, time(10, 30))
+        self.assertEqual(other_slot.end_time, time(12, 30))
+        self.assertIn(response.data[0]["id"], schedule.get_schedule(self.semester.id))
+
+    def test_bulk_create_reports_per_item_errors_and_creates_nothing(self):
+        self.client.force_authenticate(user=self.admin)
+        Tribunal.objects.create(tfm=self.tfm, slot=self.slot, index=1)
+        tfms = self.make_tfms(3)
+
+        response = self.client.post("/tribunals/bulk/", [
+            {"tfm": tfms[0].id, "slot": self.slot.id},
+            {"tfm": self.tfm.id, "slot": self.slot.id},
+            {"tfm": tfms[1].id, "slot": self.slot.id},
+            {"tfm": tfms[2].id, "slot": 9999},
+        ], format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("tfm", response.data[1])
+        self.assertIn("maximum", str(response.data[2]["slot"]))
+        self.assertIn("does not exist", str(response.data[3]["slot"]))
+        self.assertEqual(Tribunal.objects.count(), 1)
+
+    def test_bulk_create_query_count_does_not_grow_with_items(self):
+        self.client.force_authenticate(user=self.admin)
+        slots = [
+            Slot.objects.create(track=self.track, start_time=time(9, 0), end_time=time(9, 0),
+                                date=date(2025, 6, 18), room=f"R{i}", max_tfms=5)
+            for i in range(4)
+        ]
+        tfms = self.make_tfms(20)
+        payload = [{"tfm": tfm.id, "slot": slots[i % 4].id} for i, tfm in enumerate(tfms)]
+
+        # tfms, scheduled tfms, locked slots, taken indexes, insert, end times,
+        # plus the savepoint pair of the transaction nested in the test's
+        with self.assertNumQueries(8):
+            response = self.client.post("/tribunals/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Tribunal.objects.count(), 20)
+
+    def test_bulk_create_requires_admin(self):
+        self.client.force_authenticate(user=self.president)
+        response = self.client.post("/tribunals/bulk/", [], format="json")
+        self.assertEqual(response.status_code, 403)
+
+    # ──────── Scheduler Tests ────────
+
+    def make_unscheduled_tfms(self, count, directors=()):
+        """Approved TFMs created inside self.semester, each by its own student."""
+        tfms = self.make_tfms(count)
+        for tfm in tfms:
+            tfm.author = User.objects.create_user(
+                email=f'author{tfm.pk}@example.com', full_name=f'Author {tfm.pk}', password='x', role='student'
+            )
+            tfm.save(update_fields=['author'])
+            tfm.directors.set(directors or [self.director])
+        TFM.objects.filter(pk__in=[tfm.pk for tfm in tfms]).update(
+            created_at=timezone.make_aware(datetime(2025, 3, 1))
+        )
+        return tfms
+
+    def test_plan_fills_slots_in_index_order(self):
+        Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+        other = User.objects.create_user(email='other@example.com', full_name='Other', password='x', role='teacher')
+        tfms = self.make_unscheduled_tfms(2, directors=[other])
+
+        assignments, unassigned = scheduler.plan_defenses(self.semester)
+
+        self.assertEqual(unassigned, [{'tfm': tfms[1].id, 'title': tfms[1].title, 'reason': scheduler.NO_CAPACITY}])
+        self.assertEqual(len(assignments), 1)
+        self.assertEqual((assignments[0]['slot'], assignments[0]['index']), (self.slot.id, 2))
+        self.assertEqual(assignments[0]['start'], datetime(2025, 6, 17, 9, 45))
+
+    def test_plan_keeps_directors_out_of_overlapping_defenses(self):
+        # The director already attends self.tfm's defense, 9:00-9:45 on 17/06
+        busy_slot = Slot.objects.create(track=self.track, start_time=time(9, 0), end_time=time(9, 0),
+                                        date=date(2025, 6, 17), room="B202", max_tfms=1)
+        Tribunal.objects.create(tfm=self.tfm, slot=busy_slot)
+        self.slot.start_time = time(9, 30)
+        self.slot.save()
+        later = Slot.objects.create(track=self.track, start_time=time(12, 0), end_time=time(12, 0),
+                                    date=date(2025, 6, 17), room="C303", max_tfms=2)
+        tfms = self.make_unscheduled_tfms(2)
+
+        assignments, unassigned = scheduler.plan_defenses(self.semester)
+
+        self.assertEqual(unassigned, [])
+        self.assertEqual(
+            [(a['tfm'], a['slot'], a['index']) for a in assignments],
+            [(tfms[0].id, later.id, 1), (tfms[1].id, later.id, 2)],
+        )
+
+    def test_plan_swaps_to_place_constrained_tfm(self):
+        self.slot.max_tfms = 1
+        self.slot.save()
+        noon = [
+            Slot.objects.create(track=self.track, start_time=time(12, 0), end_time=time(12, 0),
+                                date=date(2025, 6, 17), room=room, max_tfms=1)
+            for room in ("B202", "C303")
+        ]
+        free_director = User.objects.create_user(email='free@example.com', full_name='Free', password='x', role='teacher')
+        # Greedy puts `easy` at 9:00 and `first` at noon, leaving only noon for
+        # `second`, which shares first's director; swapping frees 9:00 for it.
+        easy = self.make_unscheduled_tfms(1, directors=[free_director])[0]
+        first, second = self.make_unscheduled_tfms(2)
+
+        assignments, unassigned = scheduler.plan_defenses(self.semester)
+
+        self.assertEqual(unassigned, [])
+        by_tfm = {a['tfm']: a['slot'] for a in assignments}
+        self.assertEqual(by_tfm[second.id], self.slot.id)
+        self.assertEqual({by_tfm[easy.id], by_tfm[first.id]}, {slot.id for slot in noon})
+
+    def test_schedule_action_dry_run_and_commit(self):
+        self.client.force_authenticate(user=self.admin)
+        tfms = self.make_unscheduled_tfms(2)
+
+        response = self.client.post("/tribunals/schedule/", {"semester": self.semester.id, "dry_run": True}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["assignments"]), 2)
+        self.assertFalse(Tribunal.objects.exists())
+
+        response = self.client.post("/tribunals/schedule/", {"semester": self.semester.id}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(sorted(Tribunal.objects.values_list('tfm_id', 'index')), [(tfms[0].id, 1), (tfms[1].id, 2)])
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.end_time, time(10, 30))
+
+    def test_schedule_defenses_command(self):
+        self.make_unscheduled_tfms(1)
+        out = StringIO()
+        call_command("schedule_defenses", semester=self.semester.id, dry_run=True, stdout=out)
+        self.assertIn("Dry run: 1 tribunals planned", out.getvalue())
+        self.assertFalse(Tribunal.objects.exists())
+
+        call_command("schedule_defenses", semester=self.semester.id, stdout=StringIO())
+        self.assertEqual(Tribunal.objects.count(), 1)
+
+    # ──────── Staffing Tests ────────
+
+    def test_conflict_matrix(self):
+        at = lambda h, m: datetime(2025, 6, 17, h, m)
+        windows = [(at(9, 0), at(9, 45)), (at(9, 45), at(10, 30)), (at(9, 30), at(10, 0)), (at(12, 0), at(12, 45))]
+        self.assertEqual(staffing.conflict_matrix(windows), [0b0101, 0b0110, 0b0111, 0b1000])
+
+    def test_plan_committees_respects_directors_overlaps_and_load(self):
+        # Two overlapping defenses: self.tfm at 9:00 in A101, another at 9:00 in B202
+        first = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+        other_slot = Slot.objects.create(track=self.track, start_time=time(9, 0), end_time=time(9, 0),
+                                         date=date(2025, 6, 17), room="B202", max_tfms=1)
+        second = Tribunal.objects.create(tfm=self.make_tfms(1)[0], slot=other_slot)
+        Committee.objects.create(tribunal=second, user=self.president, role='president')
+
+        assignments, unstaffed = staffing.plan_committees(self.semester)
+
+        seats = defaultdict(dict)
+        for item in assignments:
+            seats[item['tribunal']][item['role'], item['user']] = True
+        by_tribunal = {t: sorted(user for _, user in roles) for t, roles in seats.items()}
+        # self.director directs self.tfm; self.president is busy in `second`
+        self.assertNotIn(self.director.id, by_tribunal[first.id])
+        self.assertNotIn(self.president.id, by_tribunal[first.id])
+        # No teacher sits on both overlapping tribunals
+        self.assertFalse(set(by_tribunal[first.id]) & set(by_tribunal.get(second.id, [])))
+        roles_first = sorted(role for role, _ in seats[first.id])
+        self.assertEqual(roles_first, ['president', 'secretary', 'vocal'])
+        # 5 open seats, but the director and the president are tied up in one
+        # of the two overlapping defenses each, leaving 4 free teachers
+        self.assertEqual(len(unstaffed), 1)
+        self.assertEqual(len(assignments), 4)
+
+    def test_plan_committees_skips_tribunals_created_after_the_schedule(self):
+        first = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+        rebuilt = schedule.get_schedule(self.semester.pk, refresh=True)
+        other_slot = Slot.objects.create(track=self.track, start_time=time(11, 0), end_time=time(11, 0),
+                                         date=date(2025, 6, 17), room="B202", max_tfms=1)
+        late_tfm = self.make_tfms(1)[0]
+        late_tfm.directors.add(self.director)
+        late = Tribunal.objects.create(tfm=late_tfm, slot=other_slot)
+        Committee.objects.create(tribunal=late, user=self.president, role='president')
+
+        with mock.patch.object(staffing, 'get_schedule', return_value=rebuilt):
+            assignments, unstaffed = staffing.plan_committees(self.semester)
+        self.assertEqual({item['tribunal'] for item in assignments}, {first.id})
+        self.assertEqual(len(assignments), 3)
+        self.assertEqual(unstaffed, [])
+
+    def test_staff_action_and_command(self):
+        self.client.force_authenticate(user=self.admin)
+        tribunal = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+
+        response = self.client.post("/tribunals/staff/", {"semester": self.semester.id, "dry_run": True}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["assignments"]), 3)
+        self.assertFalse(Committee.objects.exists())
+
+        call_command("staff_committees", semester=self.semester.id, stdout=StringIO())
+        self.assertTrue(Tribunal.objects.ready().filter(pk=tribunal.pk).exists())
+        self.assertEqual(staffing.plan_committees(self.semester), ([], []))
+
+    def test_stale_staffing_plan_is_refused(self):
+        tribunal = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+        assignments, _ = staffing.plan_committees(self.semester)
+        # Someone takes a seat between planning and applying
+        taken = assignments[0]
+        Committee.objects.create(tribunal_id=taken['tribunal'], user_id=taken['user'], role=taken['role'])
+
+        with self.assertRaises(serializers.ValidationError):
+            staffing.apply_plan(self.semester, assignments)
+        self.assertEqual(Committee.objects.filter(tribunal=tribunal).count(), 1)
+
+        # A unique constraint violation from a writer that skips the locks is refused the same way
+        with mock.patch.object(staffing, 'plan_committees', return_value=(assignments, [])):
+            with self.assertRaises(serializers.ValidationError):
+                staffing.apply_plan(self.semester, assignments)
+        self.assertEqual(Committee.objects.filter(tribunal=tribunal).count(), 1)
+
+    # ──────── Schedule Cache Tests ────────
+
+    def test_schedule_cache_invalidated_on_slot_and_semester_change(self):
+        tribunal = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+        entry = schedule.get_schedule(self.semester.id)[tribunal.id]
+        self.assertEqual(entry, (self.slot.date, time(9, 0), time(9, 45), "A101"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.slot.start_time = time(9, 30)
+            self.slot.room = "B202"
+            self.slot.save()
+            # Cleared on commit, so no reader can cache the old schedule again meanwhile
+            self.assertEqual(schedule.get_schedule(self.semester.id)[tribunal.id][3], "A101")
+        self.assertEqual(schedule.get_schedule(self.semester.id)[tribunal.id][1:], (time(9, 30), time(10, 15), "B202"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.semester.pre_duration = timedelta(minutes=30)
+            self.semester.save()
+        self.assertEqual(schedule.get_schedule(self.semester.id)[tribunal.id][2], time(10, 0))
+
+    def test_schedule_cache_is_reused_between_reads(self):
+        tribunal = Tribunal.objects.create(tfm=self.tfm, slot=self.slot)
+        schedule.get_schedule(self.semester.id)
+        with self.assertNumQueries(0):
+            self.assertIn(tribunal.id, schedule.get_schedule(self.semester.id))
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "needs row locks (PostgreSQL)")
+class TribunalConcurrencyTests(TransactionTestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(
+            email='student@example.com', full_name='Student User', password='test', role='student'
+        )
+        semester = Semester.objects.create(
+            name="Spring 2025", start_date=date(2025, 2, 1), end_date=date(2025, 6, 30),
+            int_presentation_date=date(2025, 6, 15), last_presentation_date=date(2025, 6, 20),
+            daily_start_time=time(8, 0), daily_end_time=time(18, 0),
+            pre_duration=timedelta(minutes=45), min_committees=3, max_committees=5
+        )
+        track = Track.objects.create(title="Test Track", semester=semester)
+        self.slot = Slot.objects.create(
+            track=track, start_time=time(9, 0), end_time=time(9, 0),
+            room="A101", date=date(2025, 6, 17), max_tfms=3
+        )
+        self.tfms = [
+            TFM.objects.create(title=f"TFM {i}", file=SimpleUploadedFile(f"t{i}.pdf", b"x"), author=self.student)
+            for i in range(6)
+        ]
+
+    def run_concurrently(self, target, count):
+        barrier = threading.Barrier(count)
+        results = []
+
+        def worker(i):
+            try:
+                barrier.wait()
+                results.append(target(i))
+            except Exception as exc:
+                results.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_serializer_creates_respect_max_tfms(self):
+        def create(i):
+            serializer = TribunalSerializer(data={"tfm": self.tfms[i].id, "slot": self.slot.id})
+            serializer.is_valid(raise_exception=True)
+            return serializer.save()
+
+        results = self.run_concurrently(create, len(self.tfms))
+
+        created = [r for r in results if isinstance(r, Tribunal)]
+        rejected = [r for r in results if isinstance(r, serializers.ValidationError)]
+        self.assertEqual((len(created), len(rejected)), (3, 3), results)
+        self.assertEqual(sorted(self.slot.tribunals.values_list('index', flat=True)), [1, 2, 3])
+        self.slot.refresh_from_db()
+        self.assertEqual(self.slot.end_time, time(11, 15))
+
+    def test_concurrent_model_saves_get_distinct_indexes(self):
+        results = self.run_concurrently(
+            lambda i: Tribunal.objects.create(tfm=self.tfms[i], slot=self.slot), 3
+        )
+        self.assertTrue(all(isinstance(r, Tribunal) for r in results), results)
+        self.assertEqual(sorted(r.index for r in results), [1, 2, 3])
@@ -1,14 +1,19 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
 from .models import Tribunal
-from .serializers import TribunalSerializer, TribunalReadSerializer
+from .serializers import TribunalSerializer, TribunalReadSerializer, TribunalBulkItemSerializer
+from . import availability, scheduler, staffing
+from .bulk import bulk_create_tribunals
+from backend.response_cache import cached_response, SCHEDULE
+from backend.instrumentation import SerializeTimingMixin
+from backend.upload_handlers import StreamingUploadMixin
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from committees.serializers import AssignCommitteeRoleSerializer
 from committees.models import Committee
-from datetime import datetime, date
+from datetime import date
 from semesters.models import Semester
-from django.db.models import Q
 from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
 
 from django_filters import rest_framework as filters
 
@@ -19,16 +24,23 @@ class TribunalFilter(filters.FilterSet):
         model = Tribunal
         fields = ["semester"]
 
-class TribunalViewSet(viewsets.ModelViewSet):
+class TribunalViewSet(SerializeTimingMixin, StreamingUploadMixin, viewsets.ModelViewSet):
     queryset = Tribunal.objects.all()
     filter_backends = [filters.DjangoFilterBackend]  # Enable filtering
     filterset_class = TribunalFilter  # Enable ?semester=ID
+    ordering = ('id',)
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve', 'available', 'ready', 'my_assignments']:
             return TribunalReadSerializer
         return TribunalSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['list', 'retrieve']:
+            return queryset.with_read_annotations()
+        return queryset
+
     def get_permissions(self):
         if self.action in ['list', 'retrieve', 'ready']:
             return [permissions.AllowAny()]
@@ -36,16 +48,19 @@ class TribunalViewSet(viewsets.ModelViewSet):
             return [permissions.IsAuthenticated()]
         return [permissions.IsAdminUser()]
 
+    @cached_response(SCHEDULE)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cached_response(SCHEDULE)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def _get_user_assigned_tribunals(self, user):
         if isinstance(user, AnonymousUser):
             return Tribunal.objects.none()  # Return empty QuerySet
 
-        return Tribunal.objects.filter(
-            Q(committees__user=user) |
-            Q(tfm__author=user)
-        ).distinct().select_related(
-            'slot__track__semester', 'tfm'
-        ).prefetch_related('committees__user')
+        return Tribunal.objects.assigned_to(user).with_read_annotations()
 
     @action(detail=False, methods=['get'])
     def my_assignments(self, request):
@@ -56,36 +71,16 @@ class TribunalViewSet(viewsets.ModelViewSet):
         if semester:
             tribunals = tribunals.filter(slot__track__semester=semester)
 
+        page = self.paginate_queryset(tribunals)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(tribunals, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def available(self, request):
-        user = request.user
-        assigned_tribunals = self._get_user_assigned_tribunals(user)
-
-        user_tribunal_times = []
-        for tribunal in assigned_tribunals:
-            slot = tribunal.slot
-            start_dt = datetime.combine(date.today(), slot.start_time) + (
-                (tribunal.index - 1) * slot.track.semester.pre_duration
-            )
-            end_dt = start_dt + slot.track.semester.pre_duration
-            user_tribunal_times.append((start_dt, end_dt))
-
-        def no_conflict(tribunal):
-            slot = tribunal.slot
-            tribunal_date = slot.date if hasattr(slot, 'date') else date.today()
-            start_dt = datetime.combine(tribunal_date, slot.start_time) + (
-                (tribunal.index - 1) * slot.track.semester.pre_duration
-            )
-            end_dt = start_dt + slot.track.semester.pre_duration
-            # Only check for conflicts on the same day
-            return all(
-                tribunal_date != usr_start.date() or not (start_dt < usr_end and end_dt > usr_start)
-                for usr_start, usr_end in user_tribunal_times
-            )
-
         # Only return tribunals from the current semester
         current_semester = Semester.objects.filter(
             start_date__lte=date.today(),
@@ -93,37 +88,100 @@ class TribunalViewSet(viewsets.ModelViewSet):
         ).first()
 
         if not current_semester:
-            return Response([], status=200)  # Or optionally return a message
-
-        all_tribunals = Tribunal.objects.select_related('slot__track__semester').filter(
-            slot__track__semester=current_semester
-        )
+            tribunals = Tribunal.objects.none()
+        else:
+            available_ids = [tribunal.pk for tribunal in availability.available_tribunals(
+                request.user, current_semester, Tribunal.objects.only('pk')
+            )]
+            # Paged like every other list; the page's rows are loaded with their read annotations
+            tribunals = Tribunal.objects.with_read_annotations().filter(pk__in=available_ids)
 
-        # Exclude tribunals the user is already assigned to
-        assigned_tribunal_ids = set(t.id for t in assigned_tribunals)
-        available_tribunals = [
-            tribunal for tribunal in all_tribunals
-            if tribunal.id not in assigned_tribunal_ids and not tribunal.is_full() and no_conflict(tribunal)
-        ]
+        page = self.paginate_queryset(tribunals)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
 
-        serializer = self.get_serializer(available_tribunals, many=True)
+        serializer = self.get_serializer(tribunals, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
+    @cached_response(SCHEDULE)
     def ready(self, request):
         """
-        Returns tribunals that are ready (>=3 committees), optionally filtered by semester.
+        Returns tribunals that are ready (president, secretary and vocal assigned), optionally filtered by semester.
         """
         semester = request.query_params.get("semester")
-        tribunals = Tribunal.objects.select_related("slot__track__semester").all()
+        tribunals = Tribunal.objects.ready().with_read_annotations()
 
         if semester:
             tribunals = tribunals.filter(slot__track__semester=semester)
 
-        ready = [tribunal for tribunal in tribunals if tribunal.is_ready()]
-        serializer = self.get_serializer(ready, many=True)
+        page = self.paginate_queryset(tribunals)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(tribunals, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create many tribunals at once from a list of {tfm, slot[, index]}; all or nothing."""
+        items = TribunalBulkItemSerializer(data=request.data, many=True)
+        items.is_valid(raise_exception=True)
+        tribunals = bulk_create_tribunals(items.validated_data)
+        return Response(TribunalSerializer(tribunals, many=True).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def schedule(self, request):
+        """
+        Assign the approved, unscheduled TFMs of a semester (default: current)
+        to its slots. With {"dry_run": true} only the plan is returned.
+        """
+        semester_id = request.data.get("semester")
+        if semester_id:
+            semester = Semester.objects.filter(pk=semester_id).first()
+        else:
+            semester = Semester.objects.filter(start_date__lte=date.today(), end_date__gte=date.today()).first()
+        if not semester:
+            return Response({"detail": "Semester not found."}, status=404)
+
+        assignments, unassigned = scheduler.plan_defenses(semester)
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("true", "1")
+        if not dry_run:
+            scheduler.apply_plan(assignments)
+
+        return Response({
+            "dry_run": dry_run,
+            "assignments": assignments,
+            "unassigned": unassigned,
+        }, status=200 if dry_run else 201)
+
+    @action(detail=False, methods=['post'])
+    def staff(self, request):
+        """
+        Fill the missing committee roles of every tribunal in a semester
+        (default: current). With {"dry_run": true} only the plan is returned.
+        """
+        semester_id = request.data.get("semester")
+        if semester_id:
+            semester = Semester.objects.filter(pk=semester_id).first()
+        else:
+            semester = Semester.objects.filter(start_date__lte=date.today(), end_date__gte=date.today()).first()
+        if not semester:
+            return Response({"detail": "Semester not found."}, status=404)
+
+        assignments, unstaffed = staffing.plan_committees(semester)
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("true", "1")
+        if not dry_run:
+            staffing.apply_plan(semester, assignments)
+
+        return Response({
+            "dry_run": dry_run,
+            "assignments": assignments,
+            "unstaffed": unstaffed,
+        }, status=200 if dry_run else 201)
+
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def auto_assign(self, request, pk=None):
         tribunal = self.get_object()
@@ -133,17 +191,20 @@ class TribunalViewSet(viewsets.ModelViewSet):
         if role not in ['president', 'secretary', 'vocal']:
             return Response({"detail": "Invalid role."}, status=400)
 
-        serializer = AssignCommitteeRoleSerializer(data={
-            "tribunal": tribunal.id,
-            "user": user.id,
-            "role": role
-        })
-
-        if serializer.is_valid():
-            serializer.save()
-            return Response({"detail": f"You have been assigned as {role}."})
-        else:
-            return Response(serializer.errors, status=400)
+        with transaction.atomic():
+            # The locks staffing.apply_plan takes, so a batch staffing cannot seat a conflicting member meanwhile
+            staffing.lock([tribunal.id], [user.id])
+            serializer = AssignCommitteeRoleSerializer(data={
+                "tribunal": tribunal.id,
+                "user": user.id,
+                "role": role
+            })
+
+            if serializer.is_valid():
+                serializer.save()
+                return Response({"detail": f"You have been assigned as {role}."})
+            else:
+                return Response(serializer.errors, status=400)
 
     def _is_tribunal_member(self, user, tribunal):
         return tribunal.committees.filter(user=user).exists()
@@ -56,7 +56,7 @@ class UserPermissionTests(TestCase):
         self.client.force_login(self.admin)
         response = self.client.get("/users/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 2)
+        self.assertGreaterEqual(len(response.data["results"]), 2)
 
     def test_student_can_see_own_detail(self):
         self.client.force_login(self.student)
@@ -93,11 +93,35 @@ class UserPermissionTests(TestCase):
         self.student.refresh_from_db()
         self.assertEqual(self.student.full_name, "Updated Student")
 
+    def test_list_users_limit_offset_pagination(self):
+        self.client.force_login(self.admin)
+        response = self.client.get("/users/?limit=2")
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual([u["id"] for u in response.data["results"]], [self.admin.id, self.student.id])
+        response = self.client.get("/users/?limit=2&offset=2")
+        self.assertEqual([u["id"] for u in response.data["results"]], [self.teacher.id])
+
+    def test_list_users_pagination_opt_out_is_capped(self):
+        from backend.pagination import AdminLimitOffsetPagination
+        self.client.force_login(self.admin)
+        response = self.client.get("/users/?paginate=false")
+        self.assertEqual(len(response.data), 3)
+        self.assertNotIn("X-Truncated", response)
+
+        original_cap = AdminLimitOffsetPagination.max_unpaginated_results
+        AdminLimitOffsetPagination.max_unpaginated_results = 2
+        try:
+            response = self.client.get("/users/?paginate=false")
+        finally:
+            AdminLimitOffsetPagination.max_unpaginated_results = original_cap
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response["X-Truncated"], "true")
+
     def test_admin_can_filter_by_teacher_role(self):
         self.client.force_login(self.admin)
         response = self.client.get("/users/?role=teacher")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(any(u["email"] == self.teacher.email for u in response.data))
+        self.assertTrue(any(u["email"] == self.teacher.email for u in response.data["results"]))
 
     def test_cannot_delete_superuser(self):
         superuser = User.objects.create_superuser(
@@ -111,8 +135,8 @@ class UserPermissionTests(TestCase):
         self.client.force_login(self.student)
         response = self.client.get("/users/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], self.student.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.student.id)
 
     def test_user_can_delete_own_account(self):
         self.client.force_login(self.student)
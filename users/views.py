@@ -7,14 +7,18 @@ from django_filters.rest_framework import DjangoFilterBackend
 
 from .serializers import UserSerializer, UserCreateSerializer, UserSelfUpdateSerializer
 from .permissions import IsAdmin
+from backend.pagination import AdminLimitOffsetPagination
+from backend.instrumentation import SerializeTimingMixin
 
 User = get_user_model()
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SerializeTimingMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['role']
+    pagination_class = AdminLimitOffsetPagination
+    ordering = ('id',)
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']: